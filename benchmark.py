@@ -0,0 +1,474 @@
+import os
+import sys
+import glob
+import json
+import time
+import platform
+import inspect
+import argparse
+import datetime
+import tempfile
+import contextlib
+import tracemalloc
+import numpy as np
+import pandas as pd
+import openpyxl
+from colorama import init, Fore, Style
+
+# Initialize colorama
+init(autoreset=True)
+
+SIZES = {'10k': 10_000, '100k': 100_000, '1m': 1_000_000}
+DEFAULT_BASELINE = 'benchmarks/baseline.json'
+
+API = 'MMS200MI'
+MCO_SHEET = 'Item Master'
+# Rule type per target field, cycled (mostly DIRECT, few per-row PYTHON rules)
+RULE_MIX = ('DIRECT', 'CONST', 'DIRECT', 'MAP', 'DIRECT', 'CONST', 'MAP', 'DIRECT', 'PYTHON', 'DIRECT')
+PYTHON_SNIPPETS = (
+    "return str(source).strip().upper()",
+    "return 'Y' if str(row.get('MMF000', '')) == '20' else 'N'",
+    "return str(source)[:10]",
+)
+# (module, class) benchmarked only when the modules package is importable
+PLATFORM_CLASSES = [
+    ('modules.extractor', 'DataExtractor'),
+    ('modules.config_loader', 'ConfigLoader'),
+    ('modules.transform_engine', 'TransformEngine'),
+    ('modules.sdt_writer', 'SDTWriter'),
+    ('modules.surgical_extractor', 'SurgicalExtractor'),
+    ('modules.sdt_utils', 'SDTUtils'),
+    ('modules.auto_detector', 'AutoDetector'),
+    ('modules.validator_analyzer', 'ValidatorAnalyzer'),
+]
+
+
+# --- SYNTHETIC DATA ---
+
+def make_movex_extract(rows, n_cols=40, prefix='MM', seed=0):
+    """
+    Movex-style extract: 6-char headers (MMITNO, MMF001...), one unique key,
+    low/medium cardinality codes, numbers and free-text descriptions.
+    """
+    rng = np.random.default_rng(seed)
+    data = {f'{prefix}ITNO': np.char.add('IT', np.arange(rows).astype(str))}
+    for i in range(n_cols - 1):
+        name = f'{prefix}F{i:03d}'
+        kind = i % 4
+        if kind == 0:    # status-like code, few values
+            data[name] = rng.choice(['10', '20', '50', '90'], rows, p=[.05, .85, .05, .05])
+        elif kind == 1:  # type/group code
+            data[name] = rng.choice([f'G{j:02d}' for j in range(25)], rows)
+        elif kind == 2:  # amounts (stored as text, like the extracts)
+            data[name] = np.round(rng.random(rows) * 1000, 2).astype(str)
+        else:            # descriptions (high cardinality)
+            data[name] = np.char.add('Desc ', rng.integers(0, rows, rows).astype(str))
+    return pd.DataFrame(data)
+
+
+def make_m3_sdt(df_leg, prefix='MM', seed=0):
+    """
+    Matching M3 data built from the extract with a known mix of
+    DIRECT / CONST / MAP / LOGIC fields, so detection has real work to do.
+    """
+    rng = np.random.default_rng(seed + 1)
+    cols = [c for c in df_leg.columns if c != f'{prefix}ITNO']
+    out = {'ITNO': df_leg[f'{prefix}ITNO'].to_numpy(), 'CONO': np.full(len(df_leg), '100')}
+    for i, col in enumerate(cols):
+        field = col[2:]
+        kind = i % 5
+        if kind == 0:    # DIRECT
+            out[field] = df_leg[col].to_numpy()
+        elif kind == 1:  # CONST
+            out[field] = np.full(len(df_leg), 'X')
+        elif kind == 2:  # MAP (value translation)
+            vals = df_leg[col].unique()
+            mapping = dict(zip(vals, rng.permutation(len(vals)).astype(str)))
+            out[field] = df_leg[col].map(mapping).to_numpy()
+        elif kind == 3:  # LOGIC (mostly one value, exceptions driven by a code)
+            driver = df_leg[cols[0]].to_numpy()
+            out[field] = np.where(driver == '90', 'B', 'A')
+        else:            # unrelated noise
+            out[field] = rng.choice(['1', '2', '3'], len(df_leg))
+    return pd.DataFrame(out)
+
+
+def write_sdt(df_tgt, path, sheet='API_MMS200MI_AddItmBasic'):
+    """SDT layout: header on row 1, two description rows, data from row 4."""
+    filler = pd.DataFrame([[''] * len(df_tgt.columns)] * 2, columns=df_tgt.columns)
+    pd.concat([filler, df_tgt], ignore_index=True).to_excel(path, sheet_name=sheet, index=False)
+
+
+def make_rules(df_leg, fields, map_dir, prefix='MM', mix=RULE_MIX):
+    """
+    Rule set for the M3 fields, cycling through mix (DIRECT/CONST/MAP/PYTHON).
+    MAP rules get a value map CSV in map_dir ('path|key|value', as TransformEngine reads it).
+    Returns (rules_df, lookups) where lookups are the sheets ConfigLoader loads.
+    """
+    rules = []
+    for i, field in enumerate(fields):
+        src = f'{prefix}{field}' if f'{prefix}{field}' in df_leg.columns else ''
+        kind = mix[i % len(mix)] if src else 'CONST'
+        value = ''
+        if kind == 'CONST':
+            value = '100' if field == 'CONO' else f'C{i}'
+        elif kind == 'MAP':
+            vals = df_leg[src].astype(str).unique()
+            map_path = os.path.join(map_dir, f'MAP_{field}.csv')
+            pd.DataFrame({'LEGACY': vals, 'M3': [f'M{j}' for j in range(len(vals))]}).to_csv(map_path, index=False)
+            value = f'{map_path}|LEGACY|M3'
+        elif kind == 'PYTHON':
+            value = PYTHON_SNIPPETS[i % len(PYTHON_SNIPPETS)]
+        rules.append({'TARGET_API': API, 'TARGET_FIELD': field, 'SOURCE_FIELD': src, 'RULE_TYPE': kind,
+                      'RULE_VALUE': value, 'SCOPE': 'GLOBAL', 'DESCRIPTION': 'Synthetic'})
+    lookups = {'STAT_MAP': pd.DataFrame({'KEY': ['10', '20', '50', '90'], 'VALUE': ['10', '20', '20', '90']})}
+    return pd.DataFrame(rules), lookups
+
+
+def write_rule_file(rules, lookups, path):
+    """Rule config layout: 'Rules' sheet, lookup sheets, empty '_Audit_Log'."""
+    with pd.ExcelWriter(path, engine='openpyxl') as writer:
+        rules.to_excel(writer, sheet_name='Rules', index=False)
+        for name, df in lookups.items(): df.to_excel(writer, sheet_name=name, index=False)
+        pd.DataFrame(columns=['TIMESTAMP']).to_excel(writer, sheet_name='_Audit_Log', index=False)
+
+
+def make_sdt_template(path, fields, api=API):
+    """
+    Empty multi-sheet SDT template: an instructions sheet, two transaction
+    sheets (all fields / every other field) and an LST sheet.
+    Returns the transaction sheet names.
+    """
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.title = 'Instructions'
+    for line in range(10): ws.append([f'Instruction line {line + 1}'])
+
+    sheets = {
+        f'API_{api}_AddItmBasic': list(fields),
+        f'API_{api}_UpdItmBasic': [f for i, f in enumerate(fields) if f == 'ITNO' or i % 2 == 0],
+        f'LST_{api}': [f for f in fields if f in ('CONO', 'ITNO')],
+    }
+    for name, cols in sheets.items():
+        ws = wb.create_sheet(name)
+        ws.append(['MESSAGE'] + cols)
+        ws.append(['Message'] + [f'{c} description' for c in cols])
+        ws.append([''] + ['Alphanumeric' for _ in cols])
+    wb.save(path)
+    return [name for name in sheets if 'MI' in name and 'LST' not in name]
+
+
+def make_mco_spec(path, objects):
+    """
+    MCO specification: one sheet per business object with the header on row 3
+    (FIELD NAME / REQUIRED / DATA CONVERSION SOURCE / RULE / API).
+    objects: {sheet_name: (api, prefix, [fields])}
+    """
+    wb = openpyxl.Workbook()
+    wb.remove(wb.active)
+    for sheet, (api, prefix, fields) in objects.items():
+        ws = wb.create_sheet(sheet)
+        ws.append([f'MCO - {sheet}'])
+        ws.append(['Generated for benchmarking'])
+        ws.append(['FIELD NAME', 'DESCRIPTION', 'CUSTOMER REQUIRED', 'DATA CONVERSION SOURCE',
+                   'TRANSFORMATION RULE', 'API'])
+        for i, field in enumerate(fields):
+            source = f'{prefix}{field}' if i % 3 else ''
+            ws.append([f'{prefix}{field}', f'{field} description', 1 if i % 2 else 0, source,
+                       '' if source else 'Fixed constant', f'{api}/AddItmBasic'])
+    wb.save(path)
+
+
+def write_surgical_config(config_dir, source_file, key, object_type='ITEM'):
+    """migration_map / source_map / surgical_def for one object, as SurgicalExtractor reads them."""
+    if not os.path.exists(config_dir): os.makedirs(config_dir)
+    pd.DataFrame([{'MCO_SHEET': MCO_SHEET, 'API_NAME': API, 'SDT_TEMPLATE': f'{API}_API.xlsx',
+                   'TRANSACTION_SHEET': f'API_{API}_AddItmBasic'}]).to_csv(os.path.join(config_dir, 'migration_map.csv'), index=False)
+    pd.DataFrame([{'MCO_SHEET': MCO_SHEET, 'SOURCE_FILE': source_file, 'JOIN_KEY': key}]).to_csv(
+        os.path.join(config_dir, 'source_map.csv'), index=False)
+    pd.DataFrame([{'OBJECT_TYPE': object_type, 'MCO_SHEET': MCO_SHEET}]).to_csv(
+        os.path.join(config_dir, 'surgical_def.csv'), index=False)
+
+
+def make_merge_source(master_path, sheet):
+    """
+    In-memory SDT to merge into master_path: same layout, every other data
+    row altered so half the rows are new and half are duplicates.
+    """
+    rows = list(openpyxl.load_workbook(master_path, read_only=True)[sheet].iter_rows(values_only=True))
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.title = sheet
+    for row in rows[:3]: ws.append(row)
+    for i, row in enumerate(rows[3:]):
+        ws.append(row if i % 2 else tuple(f'{v}_N' if v else v for v in row))
+    return wb
+
+
+# --- TIMING ---
+
+class StageTimer:
+    """Times a stage and records its Python-heap peak (tracemalloc) when enabled."""
+
+    def __init__(self, track_memory=True):
+        self.track_memory = track_memory
+        self.results = {}
+
+    def run(self, name, func, *args, **kwargs):
+        if self.track_memory:
+            tracemalloc.start()
+        start = time.perf_counter()
+        try:
+            value = func(*args, **kwargs)
+        finally:
+            seconds = time.perf_counter() - start
+            peak = 0
+            if self.track_memory:
+                _, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+        self.results[name] = {'seconds': round(seconds, 4), 'peak_mb': round(peak / 2**20, 1)}
+        print(f"      {name:<38} {seconds:9.3f}s   {peak / 2**20:9.1f} MB")
+        return value
+
+    def skip(self, name, reason):
+        print(f"      {Fore.LIGHTBLACK_EX}{name:<38} skipped ({reason}){Style.RESET_ALL}")
+
+
+def _optional_modules():
+    """Platform classes by name; only modules that import are benchmarked."""
+    found = {}
+    for module_name, class_name in PLATFORM_CLASSES:
+        try:
+            module = __import__(module_name, fromlist=[class_name])
+            found[class_name] = getattr(module, class_name)
+        except (ImportError, AttributeError):
+            continue
+    return found
+
+
+@contextlib.contextmanager
+def _in_dir(path):
+    # SurgicalExtractor reads config/ and writes surgical_staging/ relative to the cwd
+    old = os.getcwd()
+    os.chdir(path)
+    try:
+        yield
+    finally:
+        os.chdir(old)
+
+
+def run_size(label, rows, n_cols, work_dir, timer, excel=False, sample_rows=None):
+    from data_loader import load_and_align_data
+    from poc_loader import join_frames, _read_sdt_sheet
+    from poc_ai import PatternHunter
+    from sampling import verify_on_full
+
+    print(f"\n{Fore.YELLOW}>>> SIZE {label} ({rows} rows x {n_cols} cols){Style.RESET_ALL}")
+    # A fixed sample would be the whole frame at 10k; sample ~10% of every size
+    if sample_rows is None: sample_rows = max(1000, rows // 10)
+
+    df_leg = timer.run('generate_movex', make_movex_extract, rows, n_cols)
+    df_tgt = timer.run('generate_m3', make_m3_sdt, df_leg)
+
+    leg_csv = os.path.join(work_dir, f'MITMAS_{label}.csv')
+    tgt_csv = os.path.join(work_dir, f'MMS200MI_{label}.csv')
+    df_leg.to_csv(leg_csv, index=False)
+    df_tgt.to_csv(tgt_csv, index=False)
+
+    # Tracked reverse-engineering path
+    timer.run('load_and_align_data', load_and_align_data, leg_csv, tgt_csv)
+    timer.run('load_and_align_data_sampled', load_and_align_data, leg_csv, tgt_csv, sample_rows=sample_rows)
+    if excel:
+        sdt_xlsx = os.path.join(work_dir, f'MMS200MI_{label}.xlsx')
+        write_sdt(df_tgt, sdt_xlsx)
+        timer.run('read_sdt_sheet', _read_sdt_sheet, sdt_xlsx, 'API_MMS200MI_AddItmBasic')
+    else:
+        timer.skip('read_sdt_sheet', 'run with --excel')
+    # join_frames adds '__KEY__' to the frames it is given; keep the generated
+    # ones clean for the rule/template/platform stages below
+    df_leg_k, df_tgt_k = df_leg.copy(), df_tgt.copy()
+    df, src_cols, tgt_cols = timer.run('join_frames', join_frames, df_leg_k, df_tgt_k)
+    hunter = timer.run('hunter_encode', PatternHunter, df, src_cols, tgt_cols)
+    # Pool workers allocate in their own processes, where tracemalloc cannot
+    # see them; analyze in-process when memory is being measured
+    timer.run('hunter_analyze', hunter.analyze_all, tgt_cols, workers=1 if timer.track_memory else None)
+
+    df_s, src_s, tgt_s = timer.run('join_frames_sampled', join_frames, df_leg_k, df_tgt_k, sample_rows=sample_rows)
+    checks = {c: ('VALUE', 'X') for c in tgt_s if c.startswith('F')}
+    timer.run('verify_on_full', verify_on_full, df_leg_k, df_tgt_k, '__KEY__', checks)
+    del df, df_s, hunter, df_leg_k, df_tgt_k
+
+    # Inputs for the platform stages (no modules/ needed to generate these)
+    fields = list(df_tgt.columns)
+    map_dir = os.path.join(work_dir, f'maps_{label}')
+    rule_dir = os.path.join(work_dir, f'rules_{label}')
+    for d in (map_dir, rule_dir): os.makedirs(d)
+    rules, lookups = timer.run('generate_rules', make_rules, df_leg, fields, map_dir)
+    write_rule_file(rules, lookups, os.path.join(rule_dir, f'{API}.xlsx'))
+    template = os.path.join(work_dir, f'{API}_API_{label}.xlsx')
+    sheets = timer.run('generate_sdt_template', make_sdt_template, template, fields)
+    mco_path = os.path.join(work_dir, f'MCO_{label}.xlsx')
+    timer.run('generate_mco', make_mco_spec, mco_path, {
+        MCO_SHEET: (API, 'MM', fields),
+        'Customers': ('CRS610MI', 'OK', ['CUNO', 'CUNM', 'CUTP', 'STAT']),
+    })
+
+    # Platform modules (only when installed next to this script)
+    platform_cls = _optional_modules()
+
+    def available(stage, class_name, needs_excel=False):
+        if class_name not in platform_cls:
+            timer.skip(stage, 'modules package not available')
+            return False
+        if needs_excel and not excel:
+            timer.skip(stage, 'run with --excel')
+            return False
+        return True
+
+    leg_xlsx = os.path.join(work_dir, f'MITMAS_{label}.xlsx')
+    if excel and ({'DataExtractor', 'SurgicalExtractor'} & set(platform_cls)):
+        timer.run('generate_movex_xlsx', df_leg.to_excel, leg_xlsx, index=False)
+
+    if available('DataExtractor.load_data', 'DataExtractor', needs_excel=True):
+        timer.run('DataExtractor.load_data', platform_cls['DataExtractor']().load_data,
+                  leg_xlsx, format_type='MOVEX', sheet_name=0)
+
+    loaded_rules = rules
+    loaded_lookups = {name: dict(zip(df.iloc[:, 0], df.iloc[:, 1])) for name, df in lookups.items()}
+    if available('ConfigLoader.load_config', 'ConfigLoader'):
+        loader = platform_cls['ConfigLoader'](API, rule_dir=rule_dir)
+        loaded_rules, loaded_lookups = timer.run('ConfigLoader.load_config', loader.load_config, division_code='GLOBAL')
+
+    if available('TransformEngine.process', 'TransformEngine'):
+        engine = platform_cls['TransformEngine'](loaded_rules, loaded_lookups)
+        timer.run('TransformEngine.process', engine.process, df_leg)
+
+    sdt_out = None
+    if available('SDTWriter.generate_from_template', 'SDTWriter'):
+        out_dir = os.path.join(work_dir, f'output_{label}')
+        timer.run('SDTWriter.generate_from_template', platform_cls['SDTWriter'](out_dir).generate_from_template,
+                  template, df_leg, loaded_rules, sheets, f'LOAD_{API}_{label}.xlsx')
+        # The writer versions the file name, so take whatever it produced
+        written = glob.glob(os.path.join(out_dir, '*.xlsx'))
+        sdt_out = max(written, key=os.path.getmtime) if written else None
+
+    if available('SurgicalExtractor.perform_extraction', 'SurgicalExtractor', needs_excel=True):
+        write_surgical_config(os.path.join(work_dir, 'config'), os.path.abspath(leg_xlsx), 'MMITNO')
+        ids = df_leg['MMITNO'].iloc[::max(1, rows // 1000)].tolist()
+        with _in_dir(work_dir):
+            timer.run('SurgicalExtractor.perform_extraction',
+                      platform_cls['SurgicalExtractor']().perform_extraction, 'ITEM', ids)
+
+    if available('SDTUtils._merge_sheet_data', 'SDTUtils'):
+        if sdt_out is None:
+            timer.skip('SDTUtils._merge_sheet_data', 'needs SDTWriter output')
+        else:
+            wb_master = openpyxl.load_workbook(sdt_out)
+            wb_source = timer.run('generate_merge_source', make_merge_source, sdt_out, sheets[0])
+            timer.run('SDTUtils._merge_sheet_data', platform_cls['SDTUtils']()._merge_sheet_data,
+                      wb_master[sheets[0]], wb_source[sheets[0]])
+
+    if available('AutoDetector.learn_signatures', 'AutoDetector'):
+        timer.run('AutoDetector.learn_signatures', platform_cls['AutoDetector'](mco_path).learn_signatures)
+
+    if available('ValidatorAnalyzer', 'ValidatorAnalyzer'):
+        analyze = platform_cls['ValidatorAnalyzer']().reverse_engineer_rules
+        # Older analyzers take neither of the two newer options
+        extra = {'ignore_existing_config': True, 'legacy_sheet_name': 'MITMAS'}
+        params = inspect.signature(analyze).parameters
+        extra = {k: v for k, v in extra.items() if k in params}
+        timer.run('ValidatorAnalyzer', analyze, df_leg, df_tgt, 'MMITNO', 'ITNO', existing_targets=[], **extra)
+
+
+# --- BASELINES ---
+
+def compare(current, baseline, threshold, mem_threshold):
+    """
+    Returns a list of (size, stage, metric, old, new) where time grew by more
+    than threshold or the memory peak by more than mem_threshold.
+    """
+    regressions = []
+    for size, stages in current['results'].items():
+        for stage, res in stages.items():
+            old = baseline.get('results', {}).get(size, {}).get(stage)
+            if not old or stage.startswith('generate'): continue
+            # Ignore sub-10ms stages; timer noise dominates there
+            if res['seconds'] > max(old['seconds'] * (1 + threshold), 0.01):
+                regressions.append((size, stage, 'seconds', old['seconds'], res['seconds']))
+            # Peaks are 0 when either run used --no-memory; ignore sub-MB peaks
+            if old['peak_mb'] and res['peak_mb'] > max(old['peak_mb'] * (1 + mem_threshold), 1.0):
+                regressions.append((size, stage, 'peak_mb', old['peak_mb'], res['peak_mb']))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the migration/reverse-engineering stages on synthetic data.")
+    parser.add_argument('--sizes', default='10k,100k', help="Comma list of 10k,100k,1m")
+    parser.add_argument('--cols', type=int, default=40, help="Columns in the synthetic Movex extract")
+    parser.add_argument('--excel', action='store_true', help="Also write .xlsx inputs for Excel-reading stages")
+    parser.add_argument('--no-memory', action='store_true', help="Disable tracemalloc (faster, timing only)")
+    parser.add_argument('--out', default=None, help="Write results JSON here")
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help="Baseline JSON to compare against")
+    parser.add_argument('--save-baseline', action='store_true', help="Store this run as the new baseline")
+    parser.add_argument('--threshold', type=float, default=0.25, help="Allowed slowdown before failing (0.25 = 25%%)")
+    parser.add_argument('--mem-threshold', type=float, default=0.25, help="Allowed memory peak growth before failing")
+    args = parser.parse_args(argv)
+
+    sizes = [s.strip().lower() for s in args.sizes.split(',') if s.strip()]
+    unknown = [s for s in sizes if s not in SIZES]
+    if unknown:
+        print(f"{Fore.RED}Unknown size(s): {unknown}. Use {list(SIZES)}.{Style.RESET_ALL}")
+        return 2
+
+    print(f"\n{Fore.BLUE}=== M3 MIGRATION BENCHMARK ==={Style.RESET_ALL}")
+    current = {
+        'timestamp': datetime.datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'numpy': np.__version__,
+        'machine': f"{platform.system()} {platform.machine()} ({os.cpu_count()} cpu)",
+        'cols': args.cols,
+        'memory': not args.no_memory,
+        'results': {},
+    }
+
+    with tempfile.TemporaryDirectory(prefix='m3bench_') as work_dir:
+        for label in sizes:
+            timer = StageTimer(track_memory=not args.no_memory)
+            run_size(label, SIZES[label], args.cols, work_dir, timer, excel=args.excel)
+            current['results'][label] = timer.results
+
+    if args.out:
+        with open(args.out, 'w', encoding='utf-8') as f: json.dump(current, f, indent=2)
+        print(f"\nResults saved to: {args.out}")
+
+    if args.save_baseline:
+        folder = os.path.dirname(args.baseline)
+        if folder and not os.path.exists(folder): os.makedirs(folder)
+        with open(args.baseline, 'w', encoding='utf-8') as f: json.dump(current, f, indent=2)
+        print(f"{Fore.GREEN}Baseline saved to: {args.baseline}{Style.RESET_ALL}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"\n{Fore.YELLOW}No baseline at {args.baseline} (use --save-baseline).{Style.RESET_ALL}")
+        return 0
+
+    with open(args.baseline, 'r', encoding='utf-8') as f: baseline = json.load(f)
+    if baseline.get('memory', True) != current['memory']:
+        # tracemalloc slows every stage and runs hunter_analyze in-process
+        print(f"\n{Fore.YELLOW}Warning: baseline was recorded {'with' if baseline.get('memory', True) else 'without'} "
+              f"memory tracking; timings are not comparable.{Style.RESET_ALL}")
+    regressions = compare(current, baseline, args.threshold, args.mem_threshold)
+    if not regressions:
+        print(f"\n{Fore.GREEN}No regressions against baseline ({baseline.get('timestamp')}).{Style.RESET_ALL}")
+        return 0
+
+    print(f"\n{Fore.RED}Regressions (> {args.threshold:.0%} slower or > {args.mem_threshold:.0%} more memory):{Style.RESET_ALL}")
+    for size, stage, metric, old, new in regressions:
+        unit = 's' if metric == 'seconds' else ' MB'
+        print(f"   {size:<5} {stage:<38} {old:8.3f}{unit} -> {new:8.3f}{unit}")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
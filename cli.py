@@ -0,0 +1,373 @@
+"""
+Headless command-line entry point (no Tk, no prompts) for schedulers and CI.
+
+    python cli.py migrate --rules MMS200MI --source raw_data/MITMAS.xlsx
+    python cli.py batch --file jobs.xlsx
+    python cli.py load-by-id --object ITEM --ids 1001,1002
+
+Heavy libraries (pandas, openpyxl, the modules package) are imported only
+inside the subcommand that needs them, so --help and argument errors stay fast.
+
+Exit codes: 0 = success, 1 = the run failed, 2 = bad arguments,
+3 = environment problem (missing file, module or dependency).
+"""
+import os
+import sys
+import glob
+import re
+import time
+import argparse
+import datetime
+
+EXIT_OK = 0
+EXIT_FAILED = 1
+EXIT_USAGE = 2
+EXIT_ENV = 3
+
+OUTPUT_DIR = 'output'
+
+
+class EnvironmentProblem(Exception):
+    """Missing input file, module or dependency (exit code 3)."""
+
+
+def _require_file(path, what):
+    if not path or not os.path.exists(path):
+        raise EnvironmentProblem(f"{what} not found: {path}")
+    return path
+
+
+def _split(value):
+    return [x.strip() for x in value.split(',') if x.strip()] if value else []
+
+
+def _output_pattern(out_name):
+    # SDTWriter writes out_name as-is when it exists, else <stem>_<YYYYmmdd>_revN.xlsx
+    stem = re.escape(out_name[:-5] if out_name.lower().endswith('.xlsx') else out_name)
+    return re.compile(stem + r'(_\d{8}_rev\d+)?\.xlsx$')
+
+
+def _output_state(out_name):
+    pattern = _output_pattern(out_name)
+    if not os.path.isdir(OUTPUT_DIR): return {}
+    return {os.path.join(OUTPUT_DIR, n): os.path.getmtime(os.path.join(OUTPUT_DIR, n))
+            for n in os.listdir(OUTPUT_DIR) if pattern.match(n)}
+
+
+def _changed_outputs(before, out_name):
+    # execute_migration reports errors by printing, so success = this run's SDT was written
+    after = _output_state(out_name)
+    return sorted(p for p, m in after.items() if before.get(p) != m)
+
+
+# --- SUBCOMMANDS ---
+
+def cmd_migrate(args):
+    from modules.migration_runner import MigrationRunner
+
+    _require_file(os.path.join('config/rules', f"{args.rules.replace('.xlsx', '')}.xlsx"), "Rule config")
+    _require_file(args.source, "Source file")
+    if args.sdt: _require_file(args.sdt, "SDT template")
+
+    program_name = args.rules.replace('.xlsx', '')
+    out_name = args.output or f"LOAD_{program_name}_{os.path.basename(args.source).replace('.xlsx', '')}.xlsx"
+    before = _output_state(out_name)
+    MigrationRunner().execute_migration(
+        program_name,
+        args.source,
+        auto_sdt=args.sdt,
+        division=args.scope.upper(),
+        target_sheets=_split(args.sheets) or None,
+        silent=True,
+        output_name_override=args.output
+    )
+    written = _changed_outputs(before, out_name)
+    for p in written: print(f"Output: {p}")
+    return EXIT_OK if written else EXIT_FAILED
+
+
+def cmd_batch(args):
+    from modules.batch_processor import BatchProcessor
+
+    _require_file(args.file, "Batch definition")
+    processor = BatchProcessor()
+    df_batch = processor.load_batch_file(args.file)
+    if df_batch is None: return EXIT_FAILED
+
+    jobs = _split(args.jobs)
+    if jobs:
+        if 'JOB_ID' not in df_batch.columns: raise EnvironmentProblem("Batch file has no JOB_ID column")
+        df_batch = df_batch[df_batch['JOB_ID'].astype(str).str.strip().isin(jobs)]
+        if df_batch.empty: raise EnvironmentProblem(f"No jobs matching {jobs}")
+
+    started = time.time()
+    processor.run_batch_execution(df_batch, force_run=bool(jobs))
+
+    # The batch log is the only place job failures are recorded
+    logs = [p for p in glob.glob(os.path.join(processor.output_dir, 'Batch_Log_*.csv')) if os.path.getmtime(p) >= started - 1]
+    if not logs: return EXIT_FAILED
+    import pandas as pd
+    try:
+        log = pd.read_csv(max(logs, key=os.path.getmtime))
+    except pd.errors.EmptyDataError:
+        # Every job was disabled: the processor writes an empty log
+        print("No jobs ran (none enabled).")
+        return EXIT_OK
+    return EXIT_FAILED if 'Status' in log.columns and (log['Status'] == 'FAILED').any() else EXIT_OK
+
+
+def run_surgical_tasks(tasks, scope='GLOBAL'):
+    """
+    Migrates the tasks of a surgical extraction into one SDT.
+    Shared by the menu (main.action_load_by_id) and the CLI.
+    Returns (tasks_run, master_output_name).
+    """
+    from colorama import Fore, Style
+    from modules.migration_runner import MigrationRunner
+    from config_registry import get_registry
+    from instrumentation import span
+
+    # One traced run for all tasks instead of one report per execute_migration
+    with span('surgical_load', tasks=len(tasks), scope=scope):
+        runner = MigrationRunner()
+        registry = get_registry()
+        print(f"\n{Fore.GREEN}Starting Execution of {len(tasks)} Surgical Tasks...{Style.RESET_ALL}")
+
+        base_prog = tasks[0]['program_name']
+        ts = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+        master_output_name = f"LOAD_{base_prog}_SURGICAL_{ts}.xlsx"
+        print(f"Target Output File: {master_output_name}")
+
+        ran = 0
+        for i, task in enumerate(tasks):
+            print(f"\n{Fore.YELLOW}>>> TASK {i+1}/{len(tasks)}: {task['program_name']} ({task['mco_sheet']}){Style.RESET_ALL}")
+            targets = registry.transactions_for(task['mco_sheet'])
+            if targets:
+                print(f"    Target Transaction(s): {targets}")
+            else:
+                print(f"{Fore.RED}    Warning: No TRANSACTION_SHEET defined. Skipping.{Style.RESET_ALL}")
+                continue
+
+            runner.execute_migration(
+                task['program_name'],
+                task['legacy_path'],
+                division=scope,
+                target_sheets=targets,
+                silent=True,
+                output_name_override=master_output_name
+            )
+            ran += 1
+
+        return ran, master_output_name
+
+
+def cmd_load_by_id(args):
+    from modules.surgical_extractor import SurgicalExtractor
+
+    ids = _split(args.ids)
+    if not ids: raise EnvironmentProblem("No IDs given")
+    tasks = SurgicalExtractor().perform_extraction(args.object.upper(), ids)
+    if not tasks:
+        print("No tasks generated. Check IDs or Source Files.")
+        return EXIT_FAILED
+
+    ran, master_output_name = run_surgical_tasks(tasks, scope=args.scope.upper())
+    # The master name is timestamped per run, so it only exists if this run wrote it
+    written = os.path.exists(os.path.join(OUTPUT_DIR, master_output_name))
+    if written: print(f"Output: {os.path.join(OUTPUT_DIR, master_output_name)}")
+    return EXIT_OK if ran and written else EXIT_FAILED
+
+
+def cmd_import_mco(args):
+    from modules.mco_importer import MCOImporter
+
+    _require_file(args.mco, "MCO file")
+    ok = MCOImporter().run_import_headless(args.mco, args.sheet, args.api.upper(), output_dir=args.out_dir)
+    return EXIT_OK if ok else EXIT_FAILED
+
+
+def cmd_check_mco(args):
+    import pandas as pd
+    from colorama import Fore, Style
+    from modules.mco_checker import MCOChecker
+
+    _require_file(args.mco, "MCO file")
+    checker = MCOChecker()
+    critical = 0
+    total = 0
+    for sheet in pd.ExcelFile(args.mco).sheet_names:
+        issues = checker._analyze_sheet(args.mco, sheet)
+        if not issues: continue
+        total += len(issues)
+        critical += sum(1 for i in issues if "CRITICAL" in i)
+        print(f"\n{Fore.YELLOW}SHEET: {sheet}{Style.RESET_ALL}")
+        for issue in issues:
+            color = Fore.RED if "CRITICAL" in issue else Fore.YELLOW
+            print(f"   {color}{issue}{Style.RESET_ALL}")
+
+    print(f"\nRESULT: {total} issue(s), {critical} critical.")
+    if critical or (args.strict and total): return EXIT_FAILED
+    return EXIT_OK
+
+
+def cmd_reverse_engineer(args):
+    from modules.extractor import DataExtractor
+    from modules.validator_analyzer import ValidatorAnalyzer
+    from modules.config_loader import ConfigLoader
+    from modules.rule_manager import RuleManager
+
+    _require_file(args.legacy, "Legacy file")
+    _require_file(args.gold, "Gold standard file")
+    program_name = args.rules.replace('.xlsx', '')
+
+    extractor = DataExtractor()
+    df_legacy = extractor.load_data(args.legacy, format_type='MOVEX', sheet_name=args.legacy_sheet)
+    df_gold = extractor.load_sdt_stitched(args.gold, args.gold_sheet, _split(args.merge_sheets))
+
+    existing_targets = []
+    if not args.ignore_existing:
+        rules, _ = ConfigLoader(program_name).load_config()
+        if not rules.empty: existing_targets = rules['TARGET_FIELD'].tolist()
+
+    suggestions = ValidatorAnalyzer().reverse_engineer_rules(
+        df_legacy, df_gold, args.legacy_key, args.gold_key,
+        existing_targets=existing_targets,
+        ignore_existing_config=args.ignore_existing,
+        legacy_sheet_name=args.legacy_sheet
+    )
+    if suggestions.empty:
+        print("No new patterns found.")
+        return EXIT_OK
+
+    if not os.path.exists(OUTPUT_DIR): os.makedirs(OUTPUT_DIR)
+    ts = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+    out_path = f"{OUTPUT_DIR}/{program_name}_DRAFT_{ts}.xlsx"
+    suggestions.to_excel(out_path, index=False)
+    print(f"Found {len(suggestions)} patterns. Draft saved: {out_path}")
+
+    if args.merge:
+        RuleManager().merge_draft_to_production(program_name, suggestions, overwrite=args.overwrite)
+    return EXIT_OK
+
+
+def _is_transaction_sheet(name):
+    # Same rule execute_migration uses; instruction/lookup sheets are left alone
+    return "MI" in name and "LST" not in name.upper()
+
+
+def cmd_merge_sdt(args):
+    import openpyxl
+    from modules.sdt_utils import SDTUtils
+
+    _require_file(args.master, "Master SDT")
+    for src in args.sources: _require_file(src, "Source SDT")
+
+    utils = SDTUtils()
+    wb_master = openpyxl.load_workbook(args.master)
+    only = set(_split(args.sheets))
+    merged = 0
+    for src in args.sources:
+        wb_source = openpyxl.load_workbook(src, data_only=True)
+        common = [s for s in wb_source.sheetnames if s in wb_master.sheetnames and
+                  (s in only if only else _is_transaction_sheet(s))]
+        if not common: print(f"   {os.path.basename(src)}: no matching sheets")
+        for sheet in common:
+            count = utils._merge_sheet_data(wb_master[sheet], wb_source[sheet])
+            print(f"   {os.path.basename(src)} [{sheet}]: {count} new unique rows")
+            merged += count
+        wb_source.close()
+
+    if merged: wb_master.save(args.master)
+    print(f"Merged {merged} row(s) into {args.master}")
+    return EXIT_OK
+
+
+# --- PARSER ---
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='cli.py', description="M3 Data Migration Platform (headless)")
+    sub = parser.add_subparsers(dest='command', metavar='COMMAND')
+    sub.required = True
+
+    p = sub.add_parser('migrate', help="Run one migration")
+    p.add_argument('--rules', required=True, help="Rule config name in config/rules (e.g. MMS200MI)")
+    p.add_argument('--source', required=True, help="Legacy Movex extract")
+    p.add_argument('--sdt', help="SDT template (default: config/sdt_templates/<API>_API.xlsx)")
+    p.add_argument('--scope', default='GLOBAL', help="Rule scope, e.g. DIV_US")
+    p.add_argument('--sheets', help="Comma-separated transaction sheets (default: all)")
+    p.add_argument('--output', help="Output file name override")
+    p.set_defaults(func=cmd_migrate)
+
+    p = sub.add_parser('batch', help="Run a batch job definition")
+    p.add_argument('--file', required=True, help="Batch job Excel")
+    p.add_argument('--jobs', help="Comma-separated JOB_IDs to force-run (default: all enabled)")
+    p.set_defaults(func=cmd_batch)
+
+    p = sub.add_parser('load-by-id', help="Surgical delta load")
+    p.add_argument('--object', required=True, help="Business object from surgical_def.csv (e.g. ITEM)")
+    p.add_argument('--ids', required=True, help="Comma-separated IDs")
+    p.add_argument('--scope', default='GLOBAL')
+    p.set_defaults(func=cmd_load_by_id)
+
+    p = sub.add_parser('import-mco', help="Create a master rule set from an MCO sheet")
+    p.add_argument('--mco', required=True)
+    p.add_argument('--sheet', required=True, help="MCO sheet to import")
+    p.add_argument('--api', required=True, help="Rule set name (e.g. MMS200MI)")
+    p.add_argument('--out-dir', default='config/rules')
+    p.set_defaults(func=cmd_import_mco)
+
+    p = sub.add_parser('check-mco', help="Validate an MCO specification")
+    p.add_argument('--mco', required=True)
+    p.add_argument('--strict', action='store_true', help="Fail on warnings too, not only CRITICAL issues")
+    p.set_defaults(func=cmd_check_mco)
+
+    p = sub.add_parser('reverse-engineer', help="Suggest rules from legacy vs. gold data")
+    p.add_argument('--legacy', required=True)
+    p.add_argument('--legacy-sheet', required=True)
+    p.add_argument('--gold', required=True)
+    p.add_argument('--gold-sheet', required=True, help="Main gold sheet (primary key holder)")
+    p.add_argument('--merge-sheets', help="Extra gold sheets to stitch, comma-separated")
+    p.add_argument('--legacy-key', required=True)
+    p.add_argument('--gold-key', required=True)
+    p.add_argument('--rules', required=True, help="Target rule config name")
+    p.add_argument('--ignore-existing', action='store_true', help="Re-evaluate fields that already have rules")
+    p.add_argument('--merge', action='store_true', help="Merge the draft into the production rules")
+    p.add_argument('--overwrite', action='store_true', help="With --merge: overwrite existing rules")
+    p.set_defaults(func=cmd_reverse_engineer)
+
+    p = sub.add_parser('merge-sdt', help="Merge SDT files into a master with de-duplication")
+    p.add_argument('--master', required=True)
+    p.add_argument('--sources', required=True, nargs='+')
+    p.add_argument('--sheets', help="Only these sheets (default: common transaction sheets, e.g. API_MMS200MI_AddItmBasic)")
+    p.set_defaults(func=cmd_merge_sdt)
+
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    try:
+        args = parser.parse_args(argv)
+    except SystemExit as e:
+        return EXIT_OK if e.code == 0 else EXIT_USAGE
+
+    try:
+        from instrumentation import install_from_env, span
+        install_from_env()
+        # Top-level span so each invocation is one traced run
+        with span(f"cli_{args.command.replace('-', '_')}"):
+            return args.func(args)
+    except EnvironmentProblem as e:
+        print(f"ERROR: {e}", file=sys.stderr)
+        return EXIT_ENV
+    except ImportError as e:
+        print(f"ERROR: Missing module or dependency: {e}", file=sys.stderr)
+        return EXIT_ENV
+    except Exception as e:
+        print(f"FAILED: {e}", file=sys.stderr)
+        import traceback; traceback.print_exc()
+        return EXIT_FAILED
+
+
+if __name__ == "__main__":
+    sys.exit(main())
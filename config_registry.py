@@ -0,0 +1,185 @@
+import os
+import csv
+import threading
+from colorama import Fore, Style
+
+CONFIG_DIR = 'config'
+SDT_DIR = 'config/sdt_templates'
+
+MIGRATION_MAP = 'migration_map.csv'
+SOURCE_MAP = 'source_map.csv'
+SURGICAL_DEF = 'surgical_def.csv'
+
+
+def _norm(value):
+    return str(value).strip().upper() if value is not None else ''
+
+
+def _read_csv(path):
+    """Rows as dicts with upper-cased headers. Missing file -> []."""
+    if not os.path.exists(path): return []
+    # utf-8-sig: surgical_def.csv is saved by Excel with a BOM
+    with open(path, 'r', newline='', encoding='utf-8-sig') as f:
+        rows = []
+        for row in csv.DictReader(f):
+            rows.append({_norm(k): (v or '').strip() for k, v in row.items() if k is not None})
+        return rows
+
+
+class ConfigRegistry:
+    """
+    migration_map.csv, source_map.csv and surgical_def.csv loaded once into
+    hash indexes. Reloads automatically when any of the files change on disk,
+    and validates cross-references at load time.
+    """
+
+    def __init__(self, config_dir=CONFIG_DIR, sdt_dir=SDT_DIR, verbose=True):
+        self.config_dir = config_dir
+        self.sdt_dir = sdt_dir
+        self.verbose = verbose
+        self._lock = threading.Lock()
+        self._stamp = None
+        self.problems = []
+
+    def _paths(self):
+        return [os.path.join(self.config_dir, n) for n in (MIGRATION_MAP, SOURCE_MAP, SURGICAL_DEF)]
+
+    def _current_stamp(self):
+        stamp = []
+        for p in self._paths():
+            try:
+                st = os.stat(p)
+                stamp.append((st.st_mtime_ns, st.st_size))
+            except OSError:
+                stamp.append(None)
+        return tuple(stamp)
+
+    def _ensure_loaded(self):
+        stamp = self._current_stamp()
+        if stamp == self._stamp: return
+        with self._lock:
+            if stamp != self._stamp:
+                self._load()
+                self._stamp = stamp
+
+    # --- LOADING ---
+
+    def _load(self):
+        mig_path, src_path, surg_path = self._paths()
+
+        self.by_mco_sheet = {}     # MCO_SHEET -> entry (first row wins, like the old lookup)
+        self.by_api = {}           # API_NAME  -> first entry
+        self.sheets_by_api = {}    # API_NAME  -> [MCO_SHEET, ...]
+        for row in _read_csv(mig_path):
+            trans = [t.strip() for t in row.get('TRANSACTION_SHEET', '').split(',') if t.strip()]
+            entry = {
+                'mco_sheet': row.get('MCO_SHEET', ''),
+                'api': row.get('API_NAME') or None,
+                'sdt': row.get('SDT_TEMPLATE') or None,
+                'transactions': trans or None,
+            }
+            sheet_key, api_key = _norm(entry['mco_sheet']), _norm(entry['api'])
+            if not sheet_key: continue
+            self.by_mco_sheet.setdefault(sheet_key, entry)
+            if api_key:
+                self.by_api.setdefault(api_key, entry)
+                self.sheets_by_api.setdefault(api_key, []).append(entry['mco_sheet'])
+
+        self.sources = {}          # MCO_SHEET -> (SOURCE_FILE, JOIN_KEY)
+        for row in _read_csv(src_path):
+            key = _norm(row.get('MCO_SHEET'))
+            if key: self.sources.setdefault(key, (row.get('SOURCE_FILE', ''), row.get('JOIN_KEY', '')))
+
+        self.by_object = {}        # OBJECT_TYPE -> [MCO_SHEET, ...]
+        for row in _read_csv(surg_path):
+            obj, sheet = _norm(row.get('OBJECT_TYPE')), row.get('MCO_SHEET', '')
+            if obj and sheet: self.by_object.setdefault(obj, []).append(sheet)
+
+        self.problems = self._validate()
+        if self.verbose and self.problems:
+            print(f"{Fore.YELLOW}   [Config] {len(self.problems)} issue(s) in {self.config_dir}/:{Style.RESET_ALL}")
+            for p in self.problems[:15]: print(f"      - {p}")
+            if len(self.problems) > 15: print(f"      ... {len(self.problems) - 15} more")
+
+    def _validate(self):
+        problems = []
+        checked_sdt = set()
+        for entry in self.by_mco_sheet.values():
+            sdt = entry['sdt']
+            if sdt and sdt not in checked_sdt:
+                checked_sdt.add(sdt)
+                if not os.path.exists(os.path.join(self.sdt_dir, sdt)):
+                    problems.append(f"{MIGRATION_MAP}: template '{sdt}' not found in {self.sdt_dir}")
+
+        for sheet, (source_file, join_key) in self.sources.items():
+            if sheet not in self.by_mco_sheet:
+                problems.append(f"{SOURCE_MAP}: MCO sheet '{sheet}' is not in {MIGRATION_MAP}")
+            if not source_file:
+                problems.append(f"{SOURCE_MAP}: no SOURCE_FILE for '{sheet}'")
+            elif not os.path.exists(source_file):
+                problems.append(f"{SOURCE_MAP}: source '{source_file}' for '{sheet}' not found")
+            if not join_key:
+                problems.append(f"{SOURCE_MAP}: no JOIN_KEY for '{sheet}'")
+
+        for obj, sheets in self.by_object.items():
+            for sheet in sheets:
+                key = _norm(sheet)
+                if key not in self.by_mco_sheet:
+                    problems.append(f"{SURGICAL_DEF}: {obj} -> '{sheet}' is not in {MIGRATION_MAP}")
+                elif not self.by_mco_sheet[key]['transactions']:
+                    problems.append(f"{SURGICAL_DEF}: {obj} -> '{sheet}' has no TRANSACTION_SHEET")
+                if key not in self.sources:
+                    problems.append(f"{SURGICAL_DEF}: {obj} -> '{sheet}' has no entry in {SOURCE_MAP}")
+        return problems
+
+    # --- LOOKUPS ---
+
+    def resolve(self, value, column='MCO_SHEET'):
+        """
+        Same contract as MigrationRunner.resolve_from_map_public:
+        returns (api_name, sdt_template, [transaction_sheets]) or (None, None, None).
+        """
+        self._ensure_loaded()
+        if _norm(column) not in ('MCO_SHEET', 'API_NAME'):
+            raise ValueError(f"Unsupported lookup column: {column}")
+        index = self.by_api if _norm(column) == 'API_NAME' else self.by_mco_sheet
+        entry = index.get(_norm(value))
+        if not entry: return None, None, None
+        return entry['api'], entry['sdt'], list(entry['transactions']) if entry['transactions'] else None
+
+    def transactions_for(self, mco_sheet):
+        return self.resolve(mco_sheet)[2]
+
+    def template_path(self, mco_sheet):
+        """Full path of the mapped SDT template, or None if unmapped/missing."""
+        sdt = self.resolve(mco_sheet)[1]
+        if not sdt: return None
+        path = os.path.join(self.sdt_dir, sdt)
+        return path if os.path.exists(path) else None
+
+    def source_for(self, mco_sheet):
+        """(SOURCE_FILE, JOIN_KEY) from source_map.csv, or (None, None)."""
+        self._ensure_loaded()
+        return self.sources.get(_norm(mco_sheet), (None, None))
+
+    def mco_sheets_for_object(self, object_type):
+        self._ensure_loaded()
+        return list(self.by_object.get(_norm(object_type), []))
+
+    def mco_sheets_for_api(self, api_name):
+        self._ensure_loaded()
+        return list(self.sheets_by_api.get(_norm(api_name), []))
+
+    def objects(self):
+        self._ensure_loaded()
+        return sorted(self.by_object)
+
+
+_REGISTRY = None
+
+
+def get_registry():
+    """Process-wide shared registry."""
+    global _REGISTRY
+    if _REGISTRY is None: _REGISTRY = ConfigRegistry()
+    return _REGISTRY
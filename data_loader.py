@@ -2,6 +2,7 @@ import pandas as pd
 import tkinter as tk
 from tkinter import filedialog
 import os
+from sampling import key_sample_mask
 
 def select_file(title):
     root = tk.Tk()
@@ -20,7 +21,13 @@ def normalize_header(h):
         return h[2:]
     return h
 
-def load_and_align_data(legacy_path, m3_path):
+def load_and_align_data(legacy_path, m3_path, sample_rows=None, seed=0):
+    df_leg, df_m3, leg_map = load_frames(legacy_path, m3_path)
+    df_combined, _ = align_frames(df_leg, df_m3, sample_rows=sample_rows, seed=seed)
+    return df_combined, leg_map
+
+def load_frames(legacy_path, m3_path):
+    """Loads both files with normalized headers. Returns (df_leg, df_m3, leg_map)."""
     print("\n[LOADER] Reading files...")
     
     # 1. Load Legacy
@@ -48,7 +55,20 @@ def load_and_align_data(legacy_path, m3_path):
             df_m3 = pd.read_excel(m3_path, dtype=str)
 
     df_m3.columns = [str(c).strip().upper() for c in df_m3.columns]
+    return df_leg, df_m3, leg_map
+
+def key_series(df, join_keys):
+    """One string key per row ('A|B' for composite keys)."""
+    k = df[join_keys[0]].astype(str)
+    for extra in join_keys[1:]: k = k + '|' + df[extra].astype(str)
+    return k
 
+def align_frames(df_leg, df_m3, sample_rows=None, seed=0):
+    """
+    Inner-joins the loaded frames on the first matching key(s).
+    With sample_rows, only a key-hashed sample of about that many M3 rows is joined.
+    Returns (df_combined, join_keys).
+    """
     # 3. Find Join Keys
     # Priority keys
     candidates = ['ITNO', 'CUNO', 'SUNO', 'CONO', 'ORDN']
@@ -62,9 +82,16 @@ def load_and_align_data(legacy_path, m3_path):
 
     print(f"[LOADER] Joining on keys: {join_keys}")
     
+    # Optional: key-hashed sample (same keys on both sides) instead of the full join
+    if sample_rows and len(df_m3) > sample_rows:
+        fraction = sample_rows / len(df_m3)
+        df_leg = df_leg[key_sample_mask(key_series(df_leg, join_keys), fraction, seed)]
+        df_m3 = df_m3[key_sample_mask(key_series(df_m3, join_keys), fraction, seed)]
+        print(f"[LOADER] Sampling ~{sample_rows} rows (key-hashed).")
+
     # 4. Merge
     # Inner join to analyze only matching records
     df_combined = pd.merge(df_leg, df_m3, on=join_keys, how='inner', suffixes=('_SRC', '_TGT'))
     
     print(f"[LOADER] Aligned {len(df_combined)} rows.")
-    return df_combined, leg_map
\ No newline at end of file
+    return df_combined, join_keys
\ No newline at end of file
@@ -0,0 +1,358 @@
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import re
+import datetime
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from colorama import init, Fore, Style
+
+# Initialize colorama
+init(autoreset=True)
+
+RULE_DIR = 'config/rules'
+OUTPUT_DIR = 'output'
+
+
+def _output_pattern(out_name):
+    """
+    Matches the names SDTWriter can give out_name: the name itself (an existing
+    file is appended to) or its versioned form <stem>_<YYYYmmdd>_revN.xlsx.
+    """
+    stem = re.escape(out_name[:-5] if out_name.lower().endswith('.xlsx') else out_name)
+    return re.compile(stem + r'(_\d{8}_rev\d+)?\.xlsx$')
+
+
+def _output_state(pattern):
+    if not os.path.isdir(OUTPUT_DIR): return {}
+    return {os.path.join(OUTPUT_DIR, n): os.path.getmtime(os.path.join(OUTPUT_DIR, n))
+            for n in os.listdir(OUTPUT_DIR) if pattern.match(n)}
+
+
+def _run_job(job):
+    """
+    Worker entry point (runs in a child process).
+    Executes one migration and reports which SDT it wrote.
+    """
+    from modules.migration_runner import MigrationRunner
+    from instrumentation import install_from_env
+
+    install_from_env()
+    # The revision is picked inside SDTWriter, so match only this job's own
+    # names (not other sources sharing the prefix) and compare mtimes.
+    base_src = os.path.basename(job['path']).replace('.xlsx', '')
+    out_name = f"LOAD_{job['api']}_{base_src}.xlsx"
+    pattern = _output_pattern(out_name)
+    before = _output_state(pattern)
+
+    started = time.time()
+    MigrationRunner().execute_migration(
+        job['api'],
+        job['path'],
+        auto_sdt=job['sdt'],
+        division=job['scope'],
+        target_sheets=job['sheets'],
+        silent=True
+    )
+    # execute_migration reports errors by printing, so check the artifact instead
+    written = [p for p, m in _output_state(pattern).items() if before.get(p) != m]
+    out_path = max(written, key=os.path.getmtime) if written else None
+    return {'ok': out_path is not None, 'seconds': time.time() - started, 'output': out_path,
+            'error': '' if out_path else f"No output written ({out_name})"}
+
+
+class HotFolderService:
+    """
+    Watches a drop folder for Movex extracts, classifies them with the
+    AutoDetector and queues migrations onto a bounded process pool.
+
+    Layout (inside the inbox):
+        done/              -> files migrated successfully
+        failed/            -> unidentified files or failed migrations
+        .queue.json        -> persisted queue (survives restarts)
+        ingest_log.csv     -> one line per finished file
+    """
+
+    def __init__(self, mco_path, inbox='raw_data/inbox', scope='GLOBAL', workers=2,
+                 settle_seconds=5.0, poll_interval=2.0):
+        self.mco_path = mco_path
+        self.inbox = inbox
+        self.scope = scope
+        self.workers = max(1, int(workers))
+        self.settle_seconds = settle_seconds
+        self.poll_interval = poll_interval
+
+        self.done_dir = os.path.join(inbox, 'done')
+        self.failed_dir = os.path.join(inbox, 'failed')
+        self.queue_path = os.path.join(inbox, '.queue.json')
+        self.log_path = os.path.join(inbox, 'ingest_log.csv')
+        for d in (self.inbox, self.done_dir, self.failed_dir):
+            if not os.path.exists(d): os.makedirs(d)
+
+        self.detector = None
+        self.registry = None
+        self.pending = {}     # path -> (size, mtime, first_seen_stable)
+        self.queue = []       # jobs waiting for a worker
+        self.running = {}     # future -> job
+
+        self.started_at = time.time()
+        self.counters = {'processed': 0, 'succeeded': 0, 'failed': 0, 'unidentified': 0}
+
+    # --- CLASSIFICATION ---
+
+    def _setup(self):
+        from modules.auto_detector import AutoDetector
+        from config_registry import get_registry
+
+        self.detector = AutoDetector(self.mco_path)
+        self.detector.learn_signatures()
+        self.registry = get_registry()
+
+    def _build_job(self, path):
+        """
+        Resolves API, template and transactions for a file.
+        Returns (job, error). Mirrors the interactive auto-detect flow.
+        """
+        prefix, mco_sheet, detected_api = self.detector.identify_file(path)
+        if not prefix:
+            return None, "Could not identify file signatures"
+
+        map_api, _, trans_sheets = self.registry.resolve(mco_sheet, 'MCO_SHEET')
+        api = map_api if map_api else detected_api
+        if not api or api == "Unknown":
+            return None, f"No API resolved for MCO sheet '{mco_sheet}'"
+
+        if not os.path.exists(os.path.join(RULE_DIR, f"{api}.xlsx")):
+            return None, f"Rule config {api}.xlsx not found"
+
+        sdt_path = self.registry.template_path(mco_sheet)
+        return {
+            'path': path,
+            'mco_sheet': mco_sheet,
+            'api': api,
+            'sdt': sdt_path,
+            'sheets': trans_sheets,
+            'scope': self.scope,
+        }, None
+
+    # --- PERSISTENCE ---
+
+    def _save_queue(self):
+        jobs = self.queue + list(self.running.values())
+        tmp = self.queue_path + '.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(jobs, f, indent=1)
+        os.replace(tmp, self.queue_path)
+
+    def _restore_queue(self):
+        if not os.path.exists(self.queue_path): return
+        try:
+            with open(self.queue_path, 'r', encoding='utf-8') as f:
+                jobs = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"{Fore.YELLOW}   Warning: Could not read queue file ({e}). Starting empty.{Style.RESET_ALL}")
+            return
+        # Jobs that were running when we stopped are simply re-queued
+        self.queue = [j for j in jobs if os.path.exists(j['path'])]
+        if self.queue:
+            print(f"{Fore.CYAN}   Restored {len(self.queue)} queued file(s).{Style.RESET_ALL}")
+
+    def _log(self, path, status, detail):
+        new_file = not os.path.exists(self.log_path)
+        ts = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        with open(self.log_path, 'a', encoding='utf-8') as f:
+            if new_file: f.write("TIMESTAMP,FILE,STATUS,DETAIL\n")
+            detail = str(detail).replace('"', "'")
+            f.write(f'{ts},"{os.path.basename(path)}",{status},"{detail}"\n')
+
+    def _archive(self, path, target_dir):
+        """Moves a processed file into done/ or failed/. Returns the new path."""
+        dest = os.path.join(target_dir, os.path.basename(path))
+        if os.path.exists(dest):
+            stem, ext = os.path.splitext(os.path.basename(path))
+            ts = datetime.datetime.now().strftime('%Y%m%d_%H%M%S')
+            dest = os.path.join(target_dir, f"{stem}_{ts}{ext}")
+        try:
+            shutil.move(path, dest)
+        except OSError as e:
+            print(f"{Fore.RED}   Could not move {os.path.basename(path)}: {e}{Style.RESET_ALL}")
+            return path
+        return dest
+
+    # --- WATCH LOOP ---
+
+    def _known_paths(self):
+        return {j['path'] for j in self.queue} | {j['path'] for j in self.running.values()}
+
+    def _scan(self):
+        """Returns files whose size/mtime have been stable for settle_seconds."""
+        now = time.time()
+        ready = []
+        known = self._known_paths()
+        seen = set()
+
+        for name in os.listdir(self.inbox):
+            path = os.path.join(self.inbox, name)
+            # Skip folders, Excel lock files and anything that is not a workbook
+            if not os.path.isfile(path) or name.startswith('~$') or not name.lower().endswith('.xlsx'):
+                continue
+            if path in known: continue
+            seen.add(path)
+
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            sig = (st.st_size, st.st_mtime)
+            prev = self.pending.get(path)
+            if prev is None or prev[:2] != sig:
+                self.pending[path] = (sig[0], sig[1], now)
+            elif now - prev[2] >= self.settle_seconds:
+                ready.append(path)
+
+        # Forget files that disappeared before settling
+        for path in list(self.pending):
+            if path not in seen: del self.pending[path]
+        for path in ready: del self.pending[path]
+        return sorted(ready)
+
+    def _enqueue(self, path):
+        try:
+            job, error = self._build_job(path)
+        except Exception as e:
+            job, error = None, f"Detection error: {e}"
+
+        if not job:
+            print(f"   {Fore.RED}[UNIDENTIFIED]{Style.RESET_ALL} {os.path.basename(path)}: {error}")
+            self.counters['processed'] += 1
+            self.counters['unidentified'] += 1
+            self._log(path, 'UNIDENTIFIED', error)
+            self._archive(path, self.failed_dir)
+            return
+
+        print(f"   {Fore.CYAN}[QUEUED]{Style.RESET_ALL} {os.path.basename(path)} -> {job['api']} ({job['mco_sheet']})")
+        self.queue.append(job)
+
+    def _new_pool(self):
+        return ProcessPoolExecutor(max_workers=self.workers)
+
+    def _dispatch(self, pool):
+        """Submits queued jobs. Returns the pool to keep using (replaced if it broke)."""
+        while self.queue and len(self.running) < self.workers:
+            job = self.queue.pop(0)
+            try:
+                future = pool.submit(_run_job, job)
+            except BrokenProcessPool:
+                # A worker died (e.g. killed for memory); start a fresh pool
+                print(f"{Fore.YELLOW}   Worker pool broke. Restarting it.{Style.RESET_ALL}")
+                self.queue.insert(0, job)
+                pool.shutdown(wait=False)
+                pool = self._new_pool()
+                continue
+            self.running[future] = job
+        return pool
+
+    def _collect(self):
+        for future in [f for f in self.running if f.done()]:
+            job = self.running.pop(future)
+            try:
+                result = future.result()
+            except BrokenProcessPool:
+                # Every in-flight job fails when one worker dies, so give each one
+                # more try; a file that kills its worker again is marked failed.
+                if not job.get('retried'):
+                    job['retried'] = True
+                    self.queue.insert(0, job)
+                    print(f"   {Fore.YELLOW}[RETRY]{Style.RESET_ALL} {os.path.basename(job['path'])}: worker process died")
+                    continue
+                result = {'ok': False, 'seconds': 0.0, 'error': "Worker process died (out of memory?)"}
+            except Exception as e:
+                result = {'ok': False, 'seconds': 0.0, 'error': str(e)}
+
+            self.counters['processed'] += 1
+            name = os.path.basename(job['path'])
+            if result['ok']:
+                self.counters['succeeded'] += 1
+                print(f"   {Fore.GREEN}[DONE]{Style.RESET_ALL} {name} -> {result['output']} ({result['seconds']:.1f}s)")
+                done_path = self._archive(job['path'], self.done_dir)
+                self._log(job['path'], 'SUCCESS', f"{result['output']} (source: {done_path})")
+            else:
+                self.counters['failed'] += 1
+                print(f"   {Fore.RED}[FAILED]{Style.RESET_ALL} {name}: {result['error']}")
+                self._log(job['path'], 'FAILED', result['error'])
+                self._archive(job['path'], self.failed_dir)
+
+    def stats(self):
+        """Throughput and queue-depth counters."""
+        elapsed = max(time.time() - self.started_at, 1e-9)
+        out = dict(self.counters)
+        out.update({
+            'queue_depth': len(self.queue),
+            'in_flight': len(self.running),
+            'settling': len(self.pending),
+            'uptime_s': round(elapsed, 1),
+            'files_per_min': round(self.counters['processed'] / elapsed * 60, 2),
+        })
+        return out
+
+    def run(self, once=False, status_every=60.0):
+        """
+        Main loop. With once=True, drains whatever is in the inbox and exits
+        (handy for schedulers); otherwise watches until interrupted.
+        """
+        print(f"\n{Fore.BLUE}=== HOT FOLDER SERVICE ==={Style.RESET_ALL}")
+        print(f"   Inbox: {self.inbox} | Workers: {self.workers} | Scope: {self.scope}")
+        self._setup()
+        self._restore_queue()
+        last_status = time.time()
+
+        pool = self._new_pool()
+        try:
+            while True:
+                for path in self._scan(): self._enqueue(path)
+                self._collect()
+                pool = self._dispatch(pool)
+                self._save_queue()
+
+                if time.time() - last_status >= status_every:
+                    s = self.stats()
+                    print(f"{Fore.CYAN}   [STATUS] queue={s['queue_depth']} running={s['in_flight']} "
+                          f"done={s['succeeded']} failed={s['failed'] + s['unidentified']} "
+                          f"rate={s['files_per_min']}/min{Style.RESET_ALL}")
+                    last_status = time.time()
+
+                if once and not (self.queue or self.running or self.pending): break
+                time.sleep(self.poll_interval)
+        except KeyboardInterrupt:
+            print(f"\n{Fore.YELLOW}Stopping. Unfinished files stay queued for the next start.{Style.RESET_ALL}")
+            self._save_queue()
+        finally:
+            pool.shutdown(wait=True)
+
+        return self.stats()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Watch a folder and auto-migrate Movex extracts.")
+    parser.add_argument('--mco', required=True, help="MCO specification used to learn file signatures")
+    parser.add_argument('--inbox', default='raw_data/inbox', help="Drop folder to watch")
+    parser.add_argument('--scope', default='GLOBAL', help="Rule scope (e.g. DIV_US)")
+    parser.add_argument('--workers', type=int, default=2, help="Parallel migrations")
+    parser.add_argument('--settle', type=float, default=5.0, help="Seconds a file must be unchanged before pickup")
+    parser.add_argument('--poll', type=float, default=2.0, help="Seconds between folder scans")
+    parser.add_argument('--once', action='store_true', help="Process the current inbox and exit")
+    args = parser.parse_args(argv)
+
+    service = HotFolderService(args.mco, inbox=args.inbox, scope=args.scope.upper(), workers=args.workers,
+                               settle_seconds=args.settle, poll_interval=args.poll)
+    stats = service.run(once=args.once)
+    print(f"\n{Fore.GREEN}Processed {stats['processed']} file(s): {stats['succeeded']} OK, "
+          f"{stats['failed']} failed, {stats['unidentified']} unidentified.{Style.RESET_ALL}")
+    return 0 if stats['failed'] == 0 and stats['unidentified'] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
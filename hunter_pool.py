@@ -0,0 +1,99 @@
+import os
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+# Per-process state for pool workers (set by _init_worker)
+_HUNTER = None
+_SHM = []
+
+# Hunter attributes handed to workers through shared memory instead of pickling
+SHARED_ARRAYS = ('X', 'src_hash')
+
+
+def encode_matrix(cleaned):
+    """
+    Encodes already-cleaned string columns into one C-contiguous int32 matrix.
+    cleaned: dict {col_name: Series of str}
+    Returns (X, classes) where classes[col][code] is the original value.
+    Codes follow sorted order, exactly like sklearn's LabelEncoder.
+    """
+    cols = list(cleaned)
+    n_rows = len(next(iter(cleaned.values()))) if cols else 0
+    X = np.empty((n_rows, len(cols)), dtype=np.int32, order='C')
+    classes = {}
+    for j, col in enumerate(cols):
+        codes, uniques = pd.factorize(cleaned[col].to_numpy(dtype=object), sort=True)
+        X[:, j] = codes
+        classes[col] = np.asarray(uniques, dtype=object)
+    return X, classes
+
+
+def hash_matrix(cleaned):
+    """
+    64-bit hashes of already-normalized string columns, one column each.
+    Equal strings give equal hashes, so DIRECT checks can compare these
+    instead of object arrays. Returns (H, {col_name: column_index}).
+    """
+    cols = list(cleaned)
+    n_rows = len(next(iter(cleaned.values()))) if cols else 0
+    H = np.empty((n_rows, len(cols)), dtype=np.uint64, order='C')
+    for j, col in enumerate(cols):
+        H[:, j] = hash_values(cleaned[col])
+    return H, {col: j for j, col in enumerate(cols)}
+
+
+def hash_values(values):
+    """Hashes one normalized string column the same way hash_matrix does."""
+    return pd.util.hash_array(np.asarray(values, dtype=object))
+
+
+def _init_worker(hunter, specs):
+    global _HUNTER
+    for attr, shm_name, shape, dtype in specs:
+        shm = shared_memory.SharedMemory(name=shm_name)
+        _SHM.append(shm)
+        setattr(hunter, attr, np.ndarray(shape, dtype=dtype, buffer=shm.buf))
+    _HUNTER = hunter
+
+
+def _analyze(task):
+    tgt_col, values = task
+    return tgt_col, _HUNTER.analyze_target(tgt_col, values)
+
+
+def analyze_targets(hunter, tgt_cols, workers=None):
+    """
+    Runs hunter.analyze_target for every column and returns {col: result}
+    in input order. With more than one worker the predictor matrix and the
+    source hashes are placed in shared memory once, the hunter is sent without
+    its frame, and each target column is sent only to the worker analyzing it.
+    """
+    tgt_cols = list(tgt_cols)
+    if workers is None: workers = os.cpu_count() or 1
+    workers = min(workers, len(tgt_cols))
+
+    if workers <= 1 or len(hunter.df) == 0:
+        return {col: hunter.analyze_target(col) for col in tgt_cols}
+
+    blocks, specs = [], []
+    try:
+        for attr in SHARED_ARRAYS:
+            arr = getattr(hunter, attr)
+            # SharedMemory cannot be zero-sized (e.g. no valid predictors)
+            shm = shared_memory.SharedMemory(create=True, size=max(arr.nbytes, 1))
+            blocks.append(shm)
+            np.ndarray(arr.shape, dtype=arr.dtype, buffer=shm.buf)[:] = arr
+            specs.append((attr, shm.name, arr.shape, arr.dtype))
+
+        tasks = ((col, hunter.df[col]) for col in tgt_cols)
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(hunter, specs)) as pool:
+            results = dict(pool.map(_analyze, tasks))
+    finally:
+        for shm in blocks:
+            shm.close()
+            shm.unlink()
+
+    return {col: results[col] for col in tgt_cols}
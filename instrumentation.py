@@ -0,0 +1,357 @@
+import os
+import io
+import csv
+import json
+import time
+import pstats
+import hashlib
+import cProfile
+import datetime
+import functools
+import itertools
+import threading
+import tracemalloc
+from colorama import Fore, Style
+
+try:
+    import psutil  # optional: cross-platform RSS sampling
+except ImportError:
+    psutil = None
+
+# Active tracer (None = instrumentation off, span() is a no-op)
+TRACER = None
+
+
+class _NullSpan:
+    def __enter__(self): return None
+    def __exit__(self, *exc): return False
+
+_NULL = _NullSpan()
+
+
+def _rss_mb():
+    """Current resident memory in MB, or None if it cannot be read."""
+    if psutil is not None:
+        return psutil.Process().memory_info().rss / 2**20
+    try:
+        with open('/proc/self/status', 'r') as f:
+            for line in f:
+                if line.startswith('VmRSS:'): return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+
+class Tracer:
+    """
+    Nested timing spans with peak-memory sampling.
+    When an outermost span closes, a run report (JSON + CSV) is written to output_dir.
+    Each thread's outermost span is its own run, with its own sampler and profiler.
+
+    capture: None, 'cprofile' or 'tracemalloc' (heavier; adds a profile to the report).
+    """
+
+    def __init__(self, output_dir='output', capture=None, sample_interval=0.05):
+        self.output_dir = output_dir
+        self.capture = capture
+        self.sample_interval = sample_interval
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._tracemalloc_runs = 0   # tracemalloc is process-wide; stop it with the last run
+        self._run_seq = itertools.count(1)
+
+    def _stack(self):
+        if not hasattr(self._local, 'stack'): self._local.stack = []
+        return self._local.stack
+
+    # --- MEMORY SAMPLER ---
+
+    def _sample_loop(self, run):
+        while not run['stop'].wait(self.sample_interval):
+            self._sample(run)
+
+    def _sample(self, run):
+        rss = _rss_mb()
+        if rss is None: return
+        with self._lock:
+            for node in run['open']:
+                if node['peak_mb'] is None or rss > node['peak_mb']: node['peak_mb'] = rss
+
+    # --- SPANS ---
+
+    def span(self, name, **attrs):
+        return _Span(self, name, attrs)
+
+    def _enter(self, node):
+        stack = self._stack()
+        if stack:
+            stack[-1]['children'].append(node)
+        else:
+            self._local.run = self._start_run()
+        run = self._local.run
+        stack.append(node)
+        with self._lock: run['open'].append(node)
+        self._sample(run)
+
+    def _exit(self, node):
+        run = self._local.run
+        self._sample(run)
+        with self._lock: run['open'].remove(node)
+        stack = self._stack()
+        stack.pop()
+        if not stack:
+            self._local.run = None
+            self._finish_run(run, node)
+
+    def count(self, key, seconds):
+        """Aggregates many small calls (e.g. one per row) into the innermost span."""
+        stack = self._stack()
+        if not stack: return
+        c = stack[-1]['counters'].setdefault(key, {'calls': 0, 'seconds': 0.0})
+        c['calls'] += 1
+        c['seconds'] += seconds
+
+    # --- RUN LIFECYCLE ---
+
+    def _start_run(self):
+        run = {'open': [], 'stop': threading.Event(), 'sampler': None, 'profiler': None}
+        if _rss_mb() is not None:
+            run['sampler'] = threading.Thread(target=self._sample_loop, args=(run,), daemon=True)
+            run['sampler'].start()
+        if self.capture == 'cprofile':
+            # cProfile only sees the thread that enabled it, so one profiler per run
+            profiler = cProfile.Profile()
+            try:
+                profiler.enable()
+                run['profiler'] = profiler
+            except ValueError:
+                # Python 3.12+ allows one active profiler per process; this run goes without
+                pass
+        elif self.capture == 'tracemalloc':
+            with self._lock:
+                if self._tracemalloc_runs == 0 and not tracemalloc.is_tracing(): tracemalloc.start(10)
+                self._tracemalloc_runs += 1
+        return run
+
+    def _finish_run(self, run, root):
+        run['stop'].set()
+        if run['sampler'] is not None:
+            run['sampler'].join()
+
+        ts = datetime.datetime.now().strftime('%Y%m%d_%H%M%S_%f')[:-3]
+        # pid + per-process sequence: parallel workers and short runs finish in the same ms
+        with self._lock: seq = next(self._run_seq)
+        base = os.path.join(self.output_dir, f"RUN_{root['name'].replace('.', '_')}_{ts}_{os.getpid()}_{seq}")
+        if not os.path.exists(self.output_dir): os.makedirs(self.output_dir)
+
+        report = {'run': root['name'], 'timestamp': ts, 'capture': self.capture, 'spans': root}
+        if run['profiler'] is not None:
+            run['profiler'].disable()
+            run['profiler'].dump_stats(base + '.prof')
+            out = io.StringIO()
+            pstats.Stats(run['profiler'], stream=out).sort_stats('cumulative').print_stats(25)
+            report['profile_top'] = out.getvalue().splitlines()
+        elif self.capture == 'tracemalloc':
+            # Process-wide: with concurrent runs this includes the others' allocations
+            snapshot = tracemalloc.take_snapshot() if tracemalloc.is_tracing() else None
+            with self._lock:
+                self._tracemalloc_runs -= 1
+                if self._tracemalloc_runs == 0: tracemalloc.stop()
+            if snapshot is not None:
+                report['allocations_top'] = [str(s) for s in snapshot.statistics('lineno')[:25]]
+
+        try:
+            with open(base + '.json', 'w', encoding='utf-8') as f:
+                json.dump(report, f, indent=2, default=str)
+            self._write_csv(root, base + '.csv')
+            print(f"{Fore.CYAN}   [TRACE] {root['name']}: {root['seconds']:.2f}s. Report: {base}.json{Style.RESET_ALL}")
+        except OSError as e:
+            print(f"{Fore.YELLOW}   [TRACE] Could not write run report: {e}{Style.RESET_ALL}")
+
+    def _write_csv(self, root, path):
+        with open(path, 'w', newline='', encoding='utf-8') as f:
+            w = csv.writer(f)
+            w.writerow(['PATH', 'NAME', 'SECONDS', 'PEAK_MB', 'CALLS', 'ATTRS'])
+
+            def walk(node, prefix):
+                path_name = f"{prefix}/{node['name']}" if prefix else node['name']
+                w.writerow([path_name, node['name'], round(node['seconds'], 4),
+                            node['peak_mb'] and round(node['peak_mb'], 1), 1,
+                            json.dumps(node['attrs'], default=str)])
+                for key, c in sorted(node['counters'].items(), key=lambda kv: -kv[1]['seconds']):
+                    w.writerow([f"{path_name}/{key}", key, round(c['seconds'], 4), '', c['calls'], ''])
+                for child in node['children']: walk(child, path_name)
+
+            walk(root, '')
+
+
+class _Span:
+    def __init__(self, tracer, name, attrs):
+        self.tracer = tracer
+        self.node = {'name': name, 'attrs': attrs, 'seconds': 0.0, 'peak_mb': None,
+                     'children': [], 'counters': {}}
+
+    def __enter__(self):
+        self._t0 = time.perf_counter()
+        self.tracer._enter(self.node)
+        return self.node
+
+    def __exit__(self, exc_type, exc, tb):
+        self.node['seconds'] = time.perf_counter() - self._t0
+        if exc is not None: self.node['error'] = f"{exc_type.__name__}: {exc}"
+        self.tracer._exit(self.node)
+        return False
+
+
+def span(name, **attrs):
+    """Timing span on the active tracer; costs one attribute check when tracing is off."""
+    if TRACER is None: return _NULL
+    return TRACER.span(name, **attrs)
+
+
+# --- WIRING INTO THE PLATFORM MODULES ---
+
+def _arg(args, kwargs, idx, name, default=None):
+    if name in kwargs: return kwargs[name]
+    return args[idx] if len(args) > idx else default
+
+
+def _wrap(cls, method, span_name, attrs_fn=None):
+    orig = getattr(cls, method, None)
+    if orig is None or getattr(orig, '_m3_traced', False): return
+
+    @functools.wraps(orig)
+    def wrapper(self, *args, **kwargs):
+        attrs = {}
+        if attrs_fn:
+            try: attrs = attrs_fn(args, kwargs)
+            except Exception: attrs = {}
+        with span(span_name, **attrs):
+            return orig(self, *args, **kwargs)
+
+    wrapper._m3_traced = True
+    setattr(cls, method, wrapper)
+
+
+def _wrap_counter(cls, method, key_fn):
+    """
+    For per-row calls: aggregate time per rule instead of opening a span each time.
+    Only PYTHON rules run per row through a method; the other rule types are
+    vectorized inside TransformEngine.process and are covered by its span.
+    """
+    orig = getattr(cls, method, None)
+    if orig is None or getattr(orig, '_m3_traced', False): return
+
+    @functools.wraps(orig)
+    def wrapper(self, *args, **kwargs):
+        if TRACER is None: return orig(self, *args, **kwargs)
+        t0 = time.perf_counter()
+        try:
+            return orig(self, *args, **kwargs)
+        finally:
+            TRACER.count(key_fn(args, kwargs), time.perf_counter() - t0)
+
+    wrapper._m3_traced = True
+    setattr(cls, method, wrapper)
+
+
+def _base(path):
+    return os.path.basename(str(path)) if path is not None else None
+
+
+def _rows(df):
+    return len(df) if hasattr(df, '__len__') else None
+
+
+def _python_rule_key(args, kwargs):
+    # Keyed on the whole snippet; rules often share a first line (return str(source)...)
+    code = str(_arg(args, kwargs, 0, 'code_snippet', '')).strip()
+    digest = hashlib.sha1(code.encode('utf-8')).hexdigest()[:8]
+    first = code.splitlines()[0][:60] if code else ''
+    return f"PYTHON {digest}: {first}"
+
+
+def _patch_modules():
+    """Wraps the platform entry points. Modules that cannot be imported are skipped."""
+    patched = []
+    targets = [
+        ('modules.migration_runner', 'MigrationRunner', [
+            ('execute_migration', 'execute_migration', lambda a, k: {
+                'program': _arg(a, k, 0, 'program_name'), 'source': _base(_arg(a, k, 1, 'legacy_path')),
+                'scope': _arg(a, k, 3, 'division', 'GLOBAL')}),
+        ]),
+        ('modules.batch_processor', 'BatchProcessor', [
+            ('run_batch_execution', 'run_batch_execution', lambda a, k: {'jobs': _rows(_arg(a, k, 0, 'df_batch'))}),
+        ]),
+        ('modules.surgical_extractor', 'SurgicalExtractor', [
+            ('perform_extraction', 'perform_extraction', lambda a, k: {
+                'object': _arg(a, k, 0, 'object_type'), 'ids': _rows(_arg(a, k, 1, 'id_list'))}),
+        ]),
+        ('modules.extractor', 'DataExtractor', [
+            ('load_data', 'load_data', lambda a, k: {
+                'source': _base(_arg(a, k, 0, 'file_path')), 'sheet': _arg(a, k, 2, 'sheet_name')}),
+        ]),
+        ('modules.config_loader', 'ConfigLoader', [
+            ('load_config', 'load_config', lambda a, k: {'scope': _arg(a, k, 0, 'division_code')}),
+        ]),
+        ('modules.sdt_writer', 'SDTWriter', [
+            ('generate_from_template', 'generate_from_template', lambda a, k: {
+                'template': _base(_arg(a, k, 0, 'template_path')), 'rows': _rows(_arg(a, k, 1, 'legacy_data')),
+                'rules': _rows(_arg(a, k, 2, 'rules_df')), 'sheets': _arg(a, k, 3, 'target_sheets')}),
+            # Covers only the per-sheet transform; clearing rows and writing cells happen
+            # inline in generate_from_template and are not attributed to a sheet
+            ('_transform_data', 'transform_sheet', lambda a, k: {
+                'sheet': _arg(a, k, 3, 'sheet_name'), 'fields': _rows(_arg(a, k, 2, 'valid_fields'))}),
+        ]),
+        ('modules.transform_engine', 'TransformEngine', [
+            ('process', 'TransformEngine.process', lambda a, k: {'rows': _rows(_arg(a, k, 0, 'df_source'))}),
+            ('_load_map_file', 'load_map_file', lambda a, k: {'spec': _arg(a, k, 0, 'config_str')}),
+        ]),
+    ]
+
+    for module_name, class_name, methods in targets:
+        try:
+            module = __import__(module_name, fromlist=[class_name])
+            cls = getattr(module, class_name)
+        except (ImportError, AttributeError):
+            continue
+        for method, span_name, attrs_fn in methods:
+            _wrap(cls, method, span_name, attrs_fn)
+        patched.append(class_name)
+
+    try:
+        from modules.transform_engine import TransformEngine
+        _wrap_counter(TransformEngine, '_execute_python_rule', _python_rule_key)
+    except ImportError:
+        pass
+
+    return patched
+
+
+def install(output_dir='output', capture=None):
+    """Turns tracing on and wraps the platform entry points. Returns the Tracer."""
+    global TRACER
+    if TRACER is not None: return TRACER
+    if capture not in (None, 'cprofile', 'tracemalloc'):
+        raise ValueError(f"Unknown capture mode: {capture}")
+    TRACER = Tracer(output_dir=output_dir, capture=capture)
+    patched = _patch_modules()
+    print(f"{Fore.CYAN}   [TRACE] Instrumentation on ({', '.join(patched) or 'no modules found'})."
+          f"{' Capture: ' + capture if capture else ''}{Style.RESET_ALL}")
+    return TRACER
+
+
+def install_from_env():
+    """
+    Reads M3_TRACE: unset/'0' = off, '1' = spans only,
+    'cprofile' or 'tracemalloc' = spans plus that capture.
+    Any other value prints a warning and leaves tracing off.
+    """
+    mode = os.environ.get('M3_TRACE', '').strip().lower()
+    if mode in ('', '0', 'off', 'false'): return None
+    if mode not in ('1', 'on', 'true', 'cprofile', 'tracemalloc'):
+        # A typo in the environment must not stop a migration
+        print(f"{Fore.YELLOW}   [TRACE] Warning: Unknown M3_TRACE value '{mode}'. Tracing is off.{Style.RESET_ALL}")
+        return None
+    return install(output_dir=os.environ.get('M3_TRACE_DIR', 'output'),
+                   capture=None if mode in ('1', 'on', 'true') else mode)
@@ -1,10 +1,12 @@
-import pandas as pd
-import os
 import sys
-import time
-import tkinter as tk
+
+# Headless subcommands (python main.py migrate ...) skip the menu, Tk and the heavy imports
+if __name__ == "__main__" and len(sys.argv) > 1:
+    from cli import main as cli_main
+    sys.exit(cli_main())
+
+import os
 import glob
-from tkinter import filedialog
 from colorama import init, Fore, Style
 import datetime
 
@@ -26,6 +28,9 @@ try:
     from modules.extractor import DataExtractor
     from modules.validator_analyzer import ValidatorAnalyzer
     from modules.config_loader import ConfigLoader
+    from instrumentation import install_from_env
+    from cli import run_surgical_tasks
+    from config_registry import get_registry
 except ImportError as e:
     print(f"{Fore.RED}CRITICAL ERROR: Could not import modules.{Style.RESET_ALL}")
     print(f"Details: {e}")
@@ -143,7 +148,7 @@ def action_auto_detect():
         print(f"    Prefix:      {prefix}")
         print(f"    MCO Sheet:   {mco_sheet}")
         
-        map_api, map_sdt_file, _ = runner.resolve_from_map_public(mco_sheet, 'MCO_SHEET')
+        map_api, map_sdt_file, _ = get_registry().resolve(mco_sheet, 'MCO_SHEET')
         final_api = map_api if map_api else detected_api
         final_sdt = None
         
@@ -186,38 +191,7 @@ def action_load_by_id():
     scope = input(f"\n{Fore.CYAN}>> Enter Scope (default GLOBAL): {Style.RESET_ALL}").strip().upper()
     if not scope: scope = 'GLOBAL'
 
-    runner = MigrationRunner()
-    print(f"\n{Fore.GREEN}Starting Execution of {len(tasks)} Surgical Tasks...{Style.RESET_ALL}")
-    
-    if tasks:
-        base_prog = tasks[0]['program_name']
-        ts = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-        master_output_name = f"LOAD_{base_prog}_SURGICAL_{ts}.xlsx"
-        print(f"Target Output File: {master_output_name}")
-    else: master_output_name = None
-    
-    for i, task in enumerate(tasks):
-        print(f"\n{Fore.YELLOW}>>> TASK {i+1}/{len(tasks)}: {task['program_name']} ({task['mco_sheet']}){Style.RESET_ALL}")
-        _, _, trans_sheet_list = runner.resolve_from_map_public(task['mco_sheet'], 'MCO_SHEET')
-        
-        targets = None
-        if isinstance(trans_sheet_list, list): targets = [x.strip() for x in trans_sheet_list if x]
-        elif isinstance(trans_sheet_list, str): targets = [x.strip() for x in trans_sheet_list.split(',') if x.strip()]
-        
-        if targets:
-            print(f"    Target Transaction(s): {targets}")
-        else:
-            print(f"{Fore.RED}    Warning: No TRANSACTION_SHEET defined. Skipping.{Style.RESET_ALL}")
-            continue
-
-        runner.execute_migration(
-            task['program_name'], 
-            task['legacy_path'], 
-            division=scope, 
-            target_sheets=targets, 
-            silent=True, 
-            output_name_override=master_output_name
-        )
+    run_surgical_tasks(tasks, scope=scope)
 
 def action_batch_migration():
     ui.print_header("Run Batch Migration")
@@ -398,6 +372,8 @@ def main_menu():
         else: print(f"{Fore.RED}Invalid option.{Style.RESET_ALL}")
 
 if __name__ == "__main__":
+    import tkinter as tk
+    install_from_env()  # M3_TRACE=1|cprofile|tracemalloc writes RUN_*.json/csv reports to output/
     root = tk.Tk(); root.withdraw()
     try: main_menu()
     except KeyboardInterrupt: print("\nOperation cancelled."); sys.exit(0)
\ No newline at end of file
@@ -1,8 +1,7 @@
-import pandas as pd
 import numpy as np
 from sklearn.tree import DecisionTreeClassifier, _tree
-from sklearn.preprocessing import LabelEncoder
 from colorama import Fore, Style
+from hunter_pool import encode_matrix, hash_matrix, hash_values, analyze_targets
 
 class PatternHunter:
     def __init__(self, df):
@@ -28,20 +27,37 @@ class PatternHunter:
         
         print(f"[AI] Found {len(self.valid_predictors)} valid predictor columns (out of {len(self.src_cols)}).")
 
-        # Encode Predictors for AI
-        self.encoders = {}
-        self.X_encoded = pd.DataFrame()
-        
-        for col in self.valid_predictors:
-            le = LabelEncoder()
-            # Fill NaNs with a placeholder string
-            clean_col = df[col].fillna("<<EMPTY>>").astype(str)
-            self.X_encoded[col] = le.fit_transform(clean_col)
-            self.encoders[col] = le
+        # Encode Predictors for AI (one int32 matrix, shared with pool workers)
+        # Fill NaNs with a placeholder string
+        self.X, self.classes = encode_matrix(
+            {col: df[col].fillna("<<EMPTY>>").astype(str) for col in self.valid_predictors}
+        )
+        self._X_fit = None
+
+        # Hashed normalized source columns, reused by every DIRECT check
+        self.src_hash, self.src_index = hash_matrix({col: df[col].fillna("").astype(str) for col in self.src_cols})
+
+    def __getstate__(self):
+        # Pool workers get the matrices through shared memory and their
+        # target column with each task, so neither is pickled here
+        state = self.__dict__.copy()
+        for attr in ('df', 'X', 'src_hash', '_X_fit'): state[attr] = None
+        return state
+
+    def _fit_matrix(self):
+        # sklearn trains on float32; convert once instead of on every fit
+        if self._X_fit is None: self._X_fit = self.X.astype(np.float32)
+        return self._X_fit
+
+    def analyze_all(self, tgt_cols=None, workers=None):
+        """Analyzes several targets in parallel. Returns {col: result} in order."""
+        return analyze_targets(self, self.tgt_cols if tgt_cols is None else tgt_cols, workers)
 
-    def analyze_target(self, tgt_col):
-        # Get Target Data
-        y_raw = self.df[tgt_col].fillna("").astype(str)
+    def analyze_target(self, tgt_col, values=None):
+        # Get Target Data (pool workers receive the column instead of the frame)
+        if values is None: values = self.df[tgt_col]
+        y_raw = values.fillna("").astype(str)
+        y_hash = hash_values(y_raw)
         total = len(y_raw)
         
         # 1. Check Constant
@@ -62,8 +78,7 @@ class PatternHunter:
         # Check against original source columns
         for src in self.src_cols:
             # Simple equality check
-            src_data = self.df[src].fillna("").astype(str)
-            if (src_data == y_raw).all():
+            if (self.src_hash[:, self.src_index[src]] == y_hash).all():
                 clean_src = src.replace('_SRC', '')
                 return {
                     "Type": "DIRECT",
@@ -81,7 +96,7 @@ class PatternHunter:
             
             # Train small tree (depth 2 is usually enough for human-readable rules)
             clf = DecisionTreeClassifier(max_depth=2, min_samples_leaf=1)
-            clf.fit(self.X_encoded, y_binary)
+            clf.fit(self._fit_matrix(), y_binary)
             
             # Extract Logic
             rules = self._extract_tree_rules(clf, self.valid_predictors)
@@ -124,11 +139,11 @@ class PatternHunter:
         thresh = tree_.threshold[node]
         
         # Decode threshold back to real value
-        le = self.encoders[feat]
-        # Find value closest to threshold (LabelEncoder maps to integers 0..N)
+        classes = self.classes[feat]
+        # Find value closest to threshold (codes are integers 0..N in sorted order)
         val_idx = int(thresh)
-        if val_idx < len(le.classes_):
-            real_val = le.classes_[val_idx]
+        if val_idx < len(classes):
+            real_val = classes[val_idx]
         else:
             real_val = "Unknown"
             
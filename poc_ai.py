@@ -1,8 +1,7 @@
-import pandas as pd
 import numpy as np
 from sklearn.tree import DecisionTreeClassifier, _tree
-from sklearn.preprocessing import LabelEncoder
 from colorama import Fore, Style
+from hunter_pool import encode_matrix, hash_matrix, hash_values, analyze_targets
 
 class PatternHunter:
     def __init__(self, df_combined, src_cols, tgt_cols):
@@ -11,26 +10,54 @@ class PatternHunter:
         self.tgt_cols = tgt_cols
         
         # Pre-encode sources for Decision Tree
-        self.df_encoded = pd.DataFrame()
-        self.encoders = {}
         self.valid_predictors = []
 
         print("   -> Pre-processing data for AI...")
         
+        cleaned = {}
+        first_null = {}
         for col in self.src_cols:
             # Ignore High Cardinality (IDs) if > 80% unique
             # Exception: if total rows are small (<20), allow it
             if len(self.df) > 20 and self.df[col].nunique() > (len(self.df) * 0.8): 
                 continue
             
-            series = self.df[col].astype(str).fillna("NULL")
-            le = LabelEncoder()
-            self.df_encoded[col] = le.fit_transform(series)
-            self.encoders[col] = le
+            cleaned[col] = self.df[col].astype(str).fillna("NULL")
             self.valid_predictors.append(col)
+            nulls = np.flatnonzero(self.df[col].isna().to_numpy())
+            if nulls.size: first_null[col] = nulls[0]
 
-    def analyze_target(self, tgt_col):
-        y = self.df[tgt_col].astype(str).fillna("")
+        # One int32 matrix for all predictors (shared with pool workers)
+        self.X, self.classes = encode_matrix(cleaned)
+        self._X_fit = None
+
+        # Code that blanks were encoded to, so _explain can skip them like mode() does
+        self.null_codes = {col: int(self.X[row, self.valid_predictors.index(col)]) for col, row in first_null.items()}
+
+        # Hashed normalized source columns, reused by every DIRECT check
+        self.src_hash, self.src_index = hash_matrix({col: self.df[col].astype(str).fillna("") for col in self.src_cols})
+
+    def __getstate__(self):
+        # Pool workers get the matrices through shared memory and their
+        # target column with each task, so neither is pickled here
+        state = self.__dict__.copy()
+        for attr in ('df', 'X', 'src_hash', '_X_fit'): state[attr] = None
+        return state
+
+    def _fit_matrix(self):
+        # sklearn trains on float32; convert once instead of on every fit
+        if self._X_fit is None: self._X_fit = self.X.astype(np.float32)
+        return self._X_fit
+
+    def analyze_all(self, tgt_cols=None, workers=None):
+        """Analyzes several targets in parallel. Returns {col: result} in order."""
+        return analyze_targets(self, self.tgt_cols if tgt_cols is None else tgt_cols, workers)
+
+    def analyze_target(self, tgt_col, values=None):
+        # Pool workers receive the target column instead of the frame
+        if values is None: values = self.df[tgt_col]
+        y = values.astype(str).fillna("")
+        y_hash = hash_values(y)
         counts = y.value_counts(normalize=True)
         if counts.empty: return None
         
@@ -44,7 +71,7 @@ class PatternHunter:
         # 2. DIRECT COPY
         best_src = None; best_score = 0
         for src in self.src_cols:
-            match_pct = (self.df[src].astype(str).fillna("") == y).mean() * 100
+            match_pct = (self.src_hash[:, self.src_index[src]] == y_hash).mean() * 100
             if match_pct > best_score:
                 best_score = match_pct
                 best_src = src
@@ -68,11 +95,11 @@ class PatternHunter:
         if y_binary.sum() < 2: return None
 
         # Ensure we have valid predictors
-        if self.df_encoded.empty: return None
+        if not self.valid_predictors: return None
 
         clf = DecisionTreeClassifier(max_depth=1)
         try:
-            clf.fit(self.df_encoded[self.valid_predictors], y_binary)
+            clf.fit(self._fit_matrix(), y_binary)
         except: return None
         
         if clf.tree_.node_count < 3: return None
@@ -82,16 +109,17 @@ class PatternHunter:
         
         feat = self.valid_predictors[feat_idx]
         
-        # Find correlation
-        deviants = self.df[y_binary == 1]
-        if deviants.empty: return None
+        # Find correlation: most frequent value among the deviant rows
+        deviants = self.X[y_binary.to_numpy() == 1, feat_idx]
+        if deviants.size == 0: return None
         
-        # FIX: Safety check for mode
-        mode_result = deviants[feat].mode()
-        if mode_result.empty:
+        # FIX: Safety check for mode (blanks don't count, ties go to the smallest value)
+        counts = np.bincount(deviants, minlength=len(self.classes[feat]))
+        if feat in self.null_codes: counts[self.null_codes[feat]] = 0
+        if not counts.any():
             cause = "Unknown"
         else:
-            cause = mode_result[0]
+            cause = self.classes[feat][counts.argmax()]
         
         clean_feat = feat.replace('_SRC', '')
         return f"Exceptions correlate with {clean_feat} == '{cause}'"
\ No newline at end of file
@@ -4,6 +4,7 @@ import tkinter as tk
 from tkinter import filedialog
 import os
 from colorama import Fore, Style
+from sampling import key_sample_mask
 
 def select_file(title):
     root = tk.Tk()
@@ -37,7 +38,15 @@ def _normalize_legacy_cols(cols):
             mapping[clean] = clean
     return mapping
 
-def load_and_join(legacy_path, target_path):
+def load_and_join(legacy_path, target_path, sample_rows=None):
+    df_leg, df_tgt, legacy_sheet_name = load_frames(legacy_path, target_path)
+    df_combined, valid_src, valid_tgt = join_frames(df_leg, df_tgt, sample_rows=sample_rows)
+
+    # Return legacy_sheet_name too!
+    return df_combined, valid_src, valid_tgt, legacy_sheet_name
+
+def load_frames(legacy_path, target_path):
+    """Interactive sheet selection + loading. Returns (df_leg, df_tgt, legacy_sheet_name)."""
     # 1. Load Legacy
     print("\n   -> analyzing Legacy file...")
     legacy_sheet_name = "CSV_Data"
@@ -109,6 +118,14 @@ def load_and_join(legacy_path, target_path):
         keys = [k for k in ['CONO', 'DIVI', 'ITNO', 'CUNO', 'SUNO', 'FACI', 'WHLO'] if k in common]
         if keys: df_tgt = pd.merge(df_tgt, df_other, on=keys, how='left', suffixes=('', f'_{s}'))
 
+    return df_leg, df_tgt, legacy_sheet_name
+
+def join_frames(df_leg, df_tgt, sample_rows=None, seed=0):
+    """
+    Joins Legacy <-> Target on the first common key (adds '__KEY__' to both frames).
+    With sample_rows, only a key-hashed sample of about that many target rows is joined.
+    Returns (df_combined, src_cols, tgt_cols).
+    """
     # 5. Join Legacy <-> Target
     print(f"\n   -> Matching Legacy to Target...")
     leg_map_rev = _normalize_legacy_cols(df_leg.columns)
@@ -130,7 +147,14 @@ def load_and_join(legacy_path, target_path):
     df_leg['__KEY__'] = df_leg[join_key_leg].astype(str).str.strip()
     df_tgt['__KEY__'] = df_tgt[join_key_tgt].astype(str).str.strip()
 
-    df_combined = pd.merge(df_leg, df_tgt, on='__KEY__', how='inner', suffixes=('_SRC', '_TGT'))
+    left, right = df_leg, df_tgt
+    if sample_rows and len(df_tgt) > sample_rows:
+        fraction = sample_rows / len(df_tgt)
+        left = df_leg[key_sample_mask(df_leg['__KEY__'], fraction, seed)]
+        right = df_tgt[key_sample_mask(df_tgt['__KEY__'], fraction, seed)]
+        print(f"      Sampling: {len(right)} of {len(df_tgt)} target rows (key-hashed)")
+
+    df_combined = pd.merge(left, right, on='__KEY__', how='inner', suffixes=('_SRC', '_TGT'))
     
     src_cols = [c + '_SRC' if c in df_tgt.columns else c for c in df_leg.columns if c != '__KEY__']
     tgt_cols = [c + '_TGT' if c in df_leg.columns else c for c in df_tgt.columns if c != '__KEY__']
@@ -138,5 +162,4 @@ def load_and_join(legacy_path, target_path):
     valid_src = [c for c in src_cols if c in df_combined.columns]
     valid_tgt = [c for c in tgt_cols if c in df_combined.columns]
 
-    # Return legacy_sheet_name too!
-    return df_combined, valid_src, valid_tgt, legacy_sheet_name
\ No newline at end of file
+    return df_combined, valid_src, valid_tgt
\ No newline at end of file
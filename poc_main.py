@@ -1,10 +1,22 @@
 import pandas as pd
 from colorama import init, Fore, Style
-from data_loader import select_file, load_and_join
+from data_loader import select_file, load_frames, align_frames, key_series
 from pattern_hunter import PatternHunter
+from sampling import format_confidence, verify_on_full
 
 init(autoreset=True)
 
+# Sampling mode: how many of the best suggestions get re-checked on the full data
+VERIFY_TOP = 25
+
+def _candidate(res, col, df, df_leg):
+    """Turns a suggestion into a verify_on_full check on the unjoined frames (None = can't check)."""
+    if res['Type'] == 'DIRECT':
+        # PatternHunter also compares against M3-only columns; those have no legacy side
+        src = res['Logic'].replace('Map from ', '')
+        return ('COPY', src) if src in df_leg.columns else None
+    return ('VALUE', df[col].fillna("").astype(str).value_counts().index[0])
+
 def main():
     print(f"\n{Fore.CYAN}=== M3 REVERSE ENGINEER POC (Analysis Only) ==={Style.RESET_ALL}")
     
@@ -16,9 +28,14 @@ def main():
     target_path = select_file("Select Target File")
     if not target_path: return print("Cancelled.")
 
+    val = input("3. Sample size in rows (Enter = analyze full data): ").strip()
+    sample_rows = int(val) if val.isdigit() and int(val) > 0 else None
+
     try:
         # Load
-        df, leg_map = load_and_join(legacy_path, target_path)
+        df_leg, df_m3, leg_map = load_frames(legacy_path, target_path)
+        df, join_keys = align_frames(df_leg, df_m3, sample_rows=sample_rows)
+        sampled = sample_rows is not None and len(df_m3) > sample_rows
         
         # Initialize AI
         hunter = PatternHunter(df)
@@ -26,14 +43,16 @@ def main():
         print(f"\n{Fore.YELLOW}{'TARGET':<15} | {'PROB %':<8} | {'TYPE':<8} | {'LOGIC'}{Style.RESET_ALL}")
         print("-" * 100)
 
-        # Analyze each target column
-        for col in hunter.tgt_cols:
+        # Analyze each target column (in parallel, reported in order)
+        # Skip join keys if they are just duplicates
+        targets = [c for c in hunter.tgt_cols if c.replace('_TGT', '') not in ['ITNO', 'CUNO', 'CONO']]
+        analysis = hunter.analyze_all(targets)
+        verify_pool = []
+
+        for col in targets:
             clean_name = col.replace('_TGT', '')
-            
-            # Skip join keys if they are just duplicates
-            if clean_name in ['ITNO', 'CUNO', 'CONO']: continue
 
-            res = hunter.analyze_target(col)
+            res = analysis[col]
             
             # Formatting
             pct = res['Prob']
@@ -43,6 +62,23 @@ def main():
             elif pct < 50.0: color = Fore.LIGHTBLACK_EX
             
             print(f"{color}{clean_name:<15} | {pct:5.1f}%   | {res['Type']:<8} | {res['Logic']}{Style.RESET_ALL}")
+            if sampled:
+                print(f"{'':<15}   {Fore.LIGHTBLACK_EX}{format_confidence(pct, len(df))}{Style.RESET_ALL}")
+                if res['Type'] in ('CONST', 'DIRECT', 'LOGIC'): verify_pool.append((res, col))
+
+        # Sampling mode: re-check the strongest suggestions on the full data
+        if verify_pool:
+            verify_pool = sorted(verify_pool, key=lambda x: -x[0]['Prob'])[:VERIFY_TOP]
+            print(f"\n{Fore.CYAN}Verifying top {len(verify_pool)} suggestions on full data...{Style.RESET_ALL}")
+            df_leg['__KEY__'] = key_series(df_leg, join_keys)
+            df_m3['__KEY__'] = key_series(df_m3, join_keys)
+            checks = {col.replace('_TGT', ''): _candidate(res, col, df, df_leg) for res, col in verify_pool}
+            checks = {name: check for name, check in checks.items() if check}
+            counts = verify_on_full(df_leg, df_m3, '__KEY__', checks)
+            for res, col in verify_pool:
+                name = col.replace('_TGT', '')
+                if name in counts:
+                    print(f"{name:<15} | {format_confidence(res['Prob'], len(df), verified=counts[name])}")
 
     except Exception as e:
         print(f"{Fore.RED}Error: {e}{Style.RESET_ALL}")
@@ -1,10 +1,29 @@
 import pandas as pd
 from colorama import init, Fore, Style
-from poc_loader import select_file, load_and_join
+from poc_loader import select_file, load_frames, join_frames
 from poc_ai import PatternHunter
+from sampling import format_confidence, verify_on_full
 
 init(autoreset=True)
 
+# Sampling mode: how many of the best suggestions get re-checked on the full data
+VERIFY_TOP = 25
+VERIFY_TYPES = ['CONST', 'DIRECT', 'LOGIC', 'CONST?']
+
+def _original(col, suffix, other_cols):
+    # Undo the merge suffix ('ITNO_TGT' -> 'ITNO') to address the unjoined frames
+    base = col[:-len(suffix)]
+    return base if col.endswith(suffix) and base in other_cols else col
+
+def _candidate(res, col, df, src_cols, df_leg, df_tgt):
+    """Turns a suggestion into a (target, check) pair for verify_on_full."""
+    tgt = _original(col, '_TGT', df_leg.columns)
+    if res['Type'] == 'DIRECT':
+        src = next(c for c in src_cols if c.replace('_SRC', '') == res['SOURCE_FIELD'])
+        return tgt, ('COPY', _original(src, '_SRC', df_tgt.columns))
+    top_val = df[col].astype(str).fillna("").value_counts().index[0]
+    return tgt, ('VALUE', top_val)
+
 def main():
     print(f"\n{Fore.CYAN}=== M3 REVERSE ENGINEER POC ==={Style.RESET_ALL}")
     
@@ -16,9 +35,14 @@ def main():
     target_path = select_file("Select Target File")
     if not target_path: return
 
+    val = input("3. Sample size in rows (Enter = analyze full data): ").strip()
+    sample_rows = int(val) if val.isdigit() and int(val) > 0 else None
+
     try:
         # Load (Now returns sheet name)
-        df, src_cols, tgt_cols, leg_sheet = load_and_join(legacy_path, target_path)
+        df_leg, df_tgt, leg_sheet = load_frames(legacy_path, target_path)
+        df, src_cols, tgt_cols = join_frames(df_leg, df_tgt, sample_rows=sample_rows)
+        sampled = sample_rows is not None and len(df_tgt) > sample_rows
         print(f"\n{Fore.GREEN}   -> Loaded {len(df)} aligned rows.{Style.RESET_ALL}")
         
         # AI
@@ -27,12 +51,17 @@ def main():
         print(f"\n{Fore.YELLOW}{'TARGET':<15} | {'PROB %':<8} | {'TYPE':<8} | {'LOGIC'}{Style.RESET_ALL}")
         print("-" * 100)
 
+        # Targets are analyzed in parallel, then reported in sheet order
+        skip = ['CONO', 'DIVI', 'RGDT', 'LMDT', 'RGTM', 'CHID']
+        targets = [c for c in tgt_cols if c.replace('_TGT', '') not in skip]
+        analysis = hunter.analyze_all(targets)
+
         results = []
-        for col in tgt_cols:
+        verify_pool = []
+        for col in targets:
             clean = col.replace('_TGT', '')
-            if clean in ['CONO', 'DIVI', 'RGDT', 'LMDT', 'RGTM', 'CHID']: continue
             
-            res = hunter.analyze_target(col)
+            res = analysis[col]
             if not res: continue
 
             # Print
@@ -50,9 +79,26 @@ def main():
             # Rename internal keys to match your MCO standard if desired
             res['SOURCE_FIELD'] = res.get('Logic', '').replace('Copy ', '') if res['Type'] == 'DIRECT' else ''
             res['RULE_TYPE'] = res['Type']
-            res['CONFIDENCE'] = f"{res['Prob']:.1f}%"
+            if sampled:
+                res['CONFIDENCE'] = format_confidence(res['Prob'], len(df))
+            else:
+                res['CONFIDENCE'] = f"{res['Prob']:.1f}%"
             
             results.append(res)
+            if sampled and res['Type'] in VERIFY_TYPES: verify_pool.append((res, col))
+
+        # Sampling mode: re-check the strongest suggestions on the full data
+        if verify_pool:
+            verify_pool = sorted(verify_pool, key=lambda x: -x[0]['Prob'])[:VERIFY_TOP]
+            print(f"\n{Fore.CYAN}   -> Verifying top {len(verify_pool)} suggestions on full data...{Style.RESET_ALL}")
+            checks = {}
+            for res, col in verify_pool:
+                tgt, check = _candidate(res, col, df, src_cols, df_leg, df_tgt)
+                checks[tgt] = (res, check)
+            counts = verify_on_full(df_leg, df_tgt, '__KEY__', {t: c for t, (_, c) in checks.items()})
+            for tgt, (res, _) in checks.items():
+                res['CONFIDENCE'] = format_confidence(res['Prob'], len(df), verified=counts[tgt])
+                print(f"      {res['FIELD_NAME']:<15} {res['CONFIDENCE']}")
 
         # Reorder columns for readability
         final_df = pd.DataFrame(results)
@@ -0,0 +1,76 @@
+import math
+import numpy as np
+import pandas as pd
+
+# Hash buckets used to decide which keys fall in the sample
+_BUCKETS = 1_000_000
+
+
+def key_sample_mask(keys, fraction, seed=0):
+    """
+    Boolean mask selecting roughly `fraction` of the rows by hashing the join key.
+    The same key is always in (or out of) the sample, so legacy and target
+    rows stay aligned and every key range is represented.
+    """
+    if fraction >= 1.0: return np.ones(len(keys), dtype=bool)
+    hash_key = f"{seed:016d}"[-16:]
+    h = pd.util.hash_pandas_object(keys.astype(str), index=False, hash_key=hash_key).to_numpy()
+    return (h % _BUCKETS) < int(fraction * _BUCKETS)
+
+
+def wilson_interval(hits, n, z=1.96):
+    """95% Wilson score interval for a match rate. Returns (low, high) in percent."""
+    if n <= 0: return 0.0, 100.0
+    p = hits / n
+    denom = 1 + z * z / n
+    centre = (p + z * z / (2 * n)) / denom
+    margin = z * math.sqrt(p * (1 - p) / n + z * z / (4 * n * n)) / denom
+    return max(0.0, centre - margin) * 100, min(1.0, centre + margin) * 100
+
+
+def format_confidence(prob, n, verified=None):
+    """
+    Text for the CONFIDENCE column.
+    prob: match rate on the sample (percent), n: sample rows,
+    verified: optional (hits, total) from the full-data pass.
+    """
+    if verified is not None:
+        hits, total = verified
+        rate = hits / total * 100 if total else 0.0
+        return f"{rate:.1f}% (verified on {total} rows)"
+    lo, hi = wilson_interval(prob / 100 * n, n)
+    return f"{prob:.1f}% (95% CI {lo:.1f}-{hi:.1f}%, n={n})"
+
+
+def verify_on_full(df_leg, df_tgt, key, candidates, chunk_rows=100000):
+    """
+    Streams the full legacy frame through the join in chunks and counts how
+    often each candidate rule holds, without materializing the full join.
+
+    candidates: {target_col: ('VALUE', constant) or ('COPY', legacy_col)}
+    Values are compared as strings, the way PatternHunter compares them.
+    Returns {target_col: (hits, total_rows)}.
+    """
+    tgt_cols = list(candidates)
+    src_cols = sorted({ref for kind, ref in candidates.values() if kind == 'COPY'})
+
+    # Prefix names so legacy/target columns can never collide in the merge
+    right = df_tgt[[key] + tgt_cols].rename(columns={c: f"T:{c}" for c in tgt_cols})
+    counts = {c: [0, 0] for c in tgt_cols}
+
+    for start in range(0, len(df_leg), chunk_rows):
+        left = df_leg.iloc[start:start + chunk_rows][[key] + src_cols]
+        left = left.rename(columns={c: f"L:{c}" for c in src_cols})
+        joined = left.merge(right, on=key, how='inner')
+        if joined.empty: continue
+
+        for tgt, (kind, ref) in candidates.items():
+            y = joined[f"T:{tgt}"].astype(str).fillna("")
+            if kind == 'COPY':
+                hits = (joined[f"L:{ref}"].astype(str).fillna("") == y).sum()
+            else:
+                hits = (y == ref).sum()
+            counts[tgt][0] += int(hits)
+            counts[tgt][1] += len(joined)
+
+    return {c: tuple(v) for c, v in counts.items()}